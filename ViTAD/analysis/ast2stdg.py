@@ -1,11 +1,25 @@
 
-from typing import Dict, List, Set, Optional, Tuple, Any
-from dataclasses import dataclass
+import logging
+import os
+from typing import Callable, Dict, List, Set, Optional, Tuple, Any
+from dataclasses import dataclass, field
 import pyverilog.vparser.ast as vast
-from stdg_define import (
-    CodeStructureGraph, CodeStructureNode, CodeStructureEdge,
+from stdg import (
+    CodeStructureGraph, CodeStructureNode, CodeStructureEdge, SourceCodeInfo,
     NodeType, EdgeType, ViolationInfo, ViolationType
 )
+from hierarchy import ModuleInstance, ModuleTemplate
+
+
+logger = logging.getLogger(__name__)
+
+BUILDER_VERSION = 2
+
+SYMBOL_PRIORITY = {
+    NodeType.REGISTER: 0,
+    NodeType.IO_PORT: 1,
+    NodeType.SIGNAL: 2
+}
 
 
 @dataclass
@@ -13,40 +27,156 @@ class BuildContext:
     current_module: str = ""
     current_clock_domain: Optional[str] = None
     current_source_file: str = ""
-    logic_block_counter: int = 0
+    logic_block_counters: Dict[Tuple[str, str, int], int] = field(default_factory=dict)
+    line_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+    assigned_signals: Optional[List[str]] = None
 
 
 class ASTToSTDGBuilder:
 
-    def __init__(self):
-        self.graph = CodeStructureGraph()
+    def __init__(self, graph: Optional[CodeStructureGraph] = None):
+        self.graph = graph if graph is not None else CodeStructureGraph()
         self.context = BuildContext()
+        self._symbols: Dict[str, Dict[str, Tuple[int, str]]] = {}
+        self._deferred: Dict[Tuple[str, str], List[Callable[[str], None]]] = {}
+        for node in self.graph.nodes.values():
+            self._declare_symbol(node)
+        self._handlers = {
+            vast.ModuleDef: self._handle_module_def,
+            vast.Decl: self._handle_declaration,
+            vast.Assign: self._handle_assign,
+            vast.Always: self._handle_always_block,
+            vast.InstanceList: self._handle_instance_list
+        }
 
     def build_from_ast(self, ast_node: vast.Node, source_file: str = "") -> CodeStructureGraph:
         self.context.current_source_file = source_file
+        self.context.logic_block_counters = {}
         self._visit_node(ast_node)
         return self.graph
 
+    def rebuild_source(self, ast_node: vast.Node, source_file: str, start_line: Optional[int] = None,
+                       end_line: Optional[int] = None, line_delta: Optional[int] = None) -> CodeStructureGraph:
+        reloaded_delta = self._reload_source_lines(source_file)
+        if line_delta is None:
+            line_delta = reloaded_delta
+        if line_delta:
+            end_line = None
+
+        removed_nodes, _ = self.graph.remove_source_range(source_file, start_line, end_line)
+        self._forget_symbols(removed_nodes)
+
+        if start_line is not None or end_line is not None:
+            self.context.line_range = (start_line, end_line)
+        try:
+            self.build_from_ast(ast_node, source_file)
+        finally:
+            self.context.line_range = None
+
+        for node_id in removed_nodes:
+            if node_id not in self.graph.nodes and self.graph.has_graph_node(node_id):
+                self.graph.remove_node(node_id)
+        return self.graph
+
+    def _reload_source_lines(self, source_file: str) -> int:
+        previous = self.graph.source_files.get(source_file)
+        if previous is None or not os.path.isfile(source_file):
+            return 0
+
+        self.graph.add_source_file(source_file)
+        return self.graph.source_files[source_file].line_count - previous.line_count
+
+    def _forget_symbols(self, node_ids: List[str]):
+        removed = set(node_ids)
+        for symbols in self._symbols.values():
+            for name in [name for name, (_, node_id) in symbols.items() if node_id in removed]:
+                del symbols[name]
+
+    def _source_info(self, lineno: int) -> SourceCodeInfo:
+        return SourceCodeInfo(file_path=self.context.current_source_file, line_number=lineno)
+
+    def _in_line_range(self, source_info: SourceCodeInfo) -> bool:
+        if self.context.line_range is None:
+            return True
+
+        start_line, end_line = self.context.line_range
+        return ((start_line is None or source_info.line_number >= start_line) and
+                (end_line is None or source_info.line_number <= end_line))
+
+    def _add_node(self, node: CodeStructureNode):
+        if self._in_line_range(node.source_info):
+            self.graph.add_node(node)
+
+    def _add_edge(self, edge: CodeStructureEdge):
+        if self._in_line_range(edge.source_info):
+            self.graph.add_edge(edge)
+
+    def _next_logic_id(self, prefix: str, lineno: int) -> str:
+        counters = self.context.logic_block_counters
+        key = (self.context.current_module, prefix, lineno)
+        ordinal = counters.get(key, 0)
+        counters[key] = ordinal + 1
+        return self._scoped_id(prefix, f"{lineno}_{ordinal}")
+
+    def _scoped_id(self, prefix: str, name: Any) -> str:
+        return f"{prefix}_{self.context.current_module}.{name}"
+
+    def _declare_symbol(self, node: CodeStructureNode):
+        priority = SYMBOL_PRIORITY.get(node.node_type)
+        if priority is None or not node.signal_name:
+            return
+
+        symbols = self._symbols.setdefault(node.module_name, {})
+        current = symbols.get(node.signal_name)
+        if current is not None and current[0] < priority:
+            return
+        symbols[node.signal_name] = (priority, node.node_id)
+
+        for resolve in self._deferred.pop((node.module_name, node.signal_name), ()):
+            resolve(node.node_id)
+
+    def _declare_node(self, node: CodeStructureNode):
+        self._add_node(node)
+        self._declare_symbol(node)
+
+    def _defer(self, signal_name: str, resolve: Callable[[str], None]):
+        self._deferred.setdefault((self.context.current_module, signal_name), []).append(resolve)
+
+    def _add_signal_edge(self, signal_name: str, edge: CodeStructureEdge, endpoint: str) -> bool:
+        def resolve(node_id: str):
+            setattr(edge, endpoint, node_id)
+            self._add_edge(edge)
+
+        node_id = self._get_node_id_by_signal(signal_name)
+        if node_id is None:
+            self._defer(signal_name, resolve)
+            return False
+
+        resolve(node_id)
+        return True
+
+    def _handler_for(self, node_type: type):
+        if node_type not in self._handlers:
+            self._handlers[node_type] = next(
+                (self._handlers[base] for base in node_type.__mro__[1:] if self._handlers.get(base)), None
+            )
+        return self._handlers[node_type]
+
     def _visit_node(self, node: vast.Node):
-        if isinstance(node, vast.ModuleDef):
-            self._handle_module_def(node)
-        elif isinstance(node, vast.Decl):
-            self._handle_declaration(node)
-        elif isinstance(node, vast.Assign):
-            self._handle_assign(node)
-        elif isinstance(node, vast.Always):
-            self._handle_always_block(node)
-        elif isinstance(node, vast.InstanceList):
-            self._handle_instance_list(node)
-
-
-        if hasattr(node, 'children') and node.children:
-            for child in node.children():
-                if child:
-                    self._visit_node(child)
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            handler = self._handler_for(type(current))
+            if handler is not None:
+                handler(current)
+                if not isinstance(current, vast.ModuleDef):
+                    continue
+
+            stack.extend(reversed([child for child in current.children() if child]))
 
     def _handle_module_def(self, node: vast.ModuleDef):
         self.context.current_module = node.name
+        self._deferred.clear()
 
 
         module_node = CodeStructureNode(
@@ -54,14 +184,21 @@ class ASTToSTDGBuilder:
             node_type=NodeType.MODULE,
             name=node.name,
             module_name=node.name,
-            source_location=f"{self.context.current_source_file}:{node.lineno}"
+            source_info=self._source_info(node.lineno)
         )
-        self.graph.add_node(module_node)
+        self._add_node(module_node)
 
 
         if node.portlist:
             self._handle_port_list(node.portlist)
 
+
+        ports = {}
+        for port in (node.portlist.ports if node.portlist else ()):
+            port_name = port.first.name if isinstance(port, vast.Ioport) else port.name
+            ports[port_name] = self._scoped_id("port", port_name)
+        self.graph.add_module_template(ModuleTemplate(node.name, module_node.node_id, ports))
+
     def _handle_port_list(self, portlist: vast.Portlist):
         for port in portlist.ports:
             if isinstance(port, vast.Ioport):
@@ -85,17 +222,17 @@ class ASTToSTDGBuilder:
 
 
         port_node = CodeStructureNode(
-            node_id=f"port_{port_decl.name}",
+            node_id=self._scoped_id("port", port_decl.name),
             node_type=NodeType.IO_PORT,
             name=port_decl.name,
             signal_name=port_decl.name,
             module_name=self.context.current_module,
-            source_location=f"{self.context.current_source_file}:{port_decl.lineno}",
+            source_info=self._source_info(port_decl.lineno),
             signal_width=width,
             signal_range=width_range,
             properties={"direction": direction}
         )
-        self.graph.add_node(port_node)
+        self._declare_node(port_node)
 
     def _handle_declaration(self, node: vast.Decl):
         for decl in node.list:
@@ -108,47 +245,46 @@ class ASTToSTDGBuilder:
         width, width_range = self._extract_width_info(reg_decl.width)
 
         reg_node = CodeStructureNode(
-            node_id=f"reg_{reg_decl.name}",
+            node_id=self._scoped_id("reg", reg_decl.name),
             node_type=NodeType.REGISTER,
             name=reg_decl.name,
             signal_name=reg_decl.name,
             module_name=self.context.current_module,
-            source_location=f"{self.context.current_source_file}:{reg_decl.lineno}",
+            source_info=self._source_info(reg_decl.lineno),
             signal_width=width,
             signal_range=width_range,
             clock_domain=self.context.current_clock_domain
         )
-        self.graph.add_node(reg_node)
+        self._declare_node(reg_node)
 
     def _create_signal_node(self, wire_decl: vast.Wire):
         width, width_range = self._extract_width_info(wire_decl.width)
 
         signal_node = CodeStructureNode(
-            node_id=f"signal_{wire_decl.name}",
+            node_id=self._scoped_id("signal", wire_decl.name),
             node_type=NodeType.SIGNAL,
             name=wire_decl.name,
             signal_name=wire_decl.name,
             module_name=self.context.current_module,
-            source_location=f"{self.context.current_source_file}:{wire_decl.lineno}",
+            source_info=self._source_info(wire_decl.lineno),
             signal_width=width,
             signal_range=width_range
         )
-        self.graph.add_node(signal_node)
+        self._declare_node(signal_node)
 
     def _handle_assign(self, node: vast.Assign):
 
-        logic_id = f"assign_logic_{self.context.logic_block_counter}"
-        self.context.logic_block_counter += 1
+        logic_id = self._next_logic_id("assign_logic", node.lineno)
 
         assign_node = CodeStructureNode(
             node_id=logic_id,
             node_type=NodeType.LOGIC_BLOCK,
             name=f"assign_{self._extract_signal_name(node.left)}",
             module_name=self.context.current_module,
-            source_location=f"{self.context.current_source_file}:{node.lineno}",
+            source_info=self._source_info(node.lineno),
             properties={"assign_type": "continuous"}
         )
-        self.graph.add_node(assign_node)
+        self._add_node(assign_node)
 
 
         right_signals = self._extract_signals_from_expression(node.right)
@@ -156,43 +292,43 @@ class ASTToSTDGBuilder:
 
 
         for signal in right_signals:
-            source_id = self._get_node_id_by_signal(signal)
-            if source_id:
-                edge = CodeStructureEdge(
-                    source=source_id,
-                    target=logic_id,
-                    edge_type=EdgeType.DATA_FLOW,
-                    signal_name=signal,
-                    source_location=f"{self.context.current_source_file}:{node.lineno}"
-                )
-                self.graph.add_edge(edge)
-
-
-        target_id = self._get_node_id_by_signal(left_signal)
-        if target_id:
             edge = CodeStructureEdge(
-                source=logic_id,
-                target=target_id,
+                source="",
+                target=logic_id,
                 edge_type=EdgeType.DATA_FLOW,
-                signal_name=left_signal,
-                source_location=f"{self.context.current_source_file}:{node.lineno}"
+                signal_name=signal,
+                source_info=self._source_info(node.lineno)
             )
-            self.graph.add_edge(edge)
+            self._add_signal_edge(signal, edge, "source")
+
+
+        edge = CodeStructureEdge(
+            source=logic_id,
+            target="",
+            edge_type=EdgeType.DATA_FLOW,
+            signal_name=left_signal,
+            source_info=self._source_info(node.lineno)
+        )
+        self._add_signal_edge(left_signal, edge, "target")
 
     def _handle_always_block(self, node: vast.Always):
 
         clock_signal = self._extract_clock_from_sensitivity(node.sens_list)
         old_clock_domain = self.context.current_clock_domain
         self.context.current_clock_domain = clock_signal
-
-
-        self._update_registers_clock_domain(clock_signal)
+        self.context.assigned_signals = []
 
 
         if node.statement:
             self._handle_always_statement(node.statement, node.lineno)
 
 
+        if clock_signal:
+            for signal in dict.fromkeys(self.context.assigned_signals):
+                self._update_register_clock_domain(signal, clock_signal)
+
+
+        self.context.assigned_signals = None
         self.context.current_clock_domain = old_clock_domain
 
     def _handle_always_statement(self, stmt: vast.Node, base_lineno: int):
@@ -212,8 +348,7 @@ class ASTToSTDGBuilder:
 
     def _handle_if_statement(self, stmt: vast.IfStatement, base_lineno: int):
 
-        logic_id = f"if_logic_{self.context.logic_block_counter}"
-        self.context.logic_block_counter += 1
+        logic_id = self._next_logic_id("if_logic", stmt.lineno)
 
         condition_str = self._expression_to_string(stmt.cond)
 
@@ -222,26 +357,24 @@ class ASTToSTDGBuilder:
             node_type=NodeType.LOGIC_BLOCK,
             name=f"if_condition_{condition_str}",
             module_name=self.context.current_module,
-            source_location=f"{self.context.current_source_file}:{stmt.lineno}",
+            source_info=self._source_info(stmt.lineno),
             clock_domain=self.context.current_clock_domain,
             properties={"logic_type": "conditional", "condition": condition_str}
         )
-        self.graph.add_node(if_node)
+        self._add_node(if_node)
 
 
         condition_signals = self._extract_signals_from_expression(stmt.cond)
         for signal in condition_signals:
-            source_id = self._get_node_id_by_signal(signal)
-            if source_id:
-                edge = CodeStructureEdge(
-                    source=source_id,
-                    target=logic_id,
-                    edge_type=EdgeType.CONTROL_FLOW,
-                    signal_name=signal,
-                    condition=condition_str,
-                    source_location=f"{self.context.current_source_file}:{stmt.lineno}"
-                )
-                self.graph.add_edge(edge)
+            edge = CodeStructureEdge(
+                source="",
+                target=logic_id,
+                edge_type=EdgeType.CONTROL_FLOW,
+                signal_name=signal,
+                condition=condition_str,
+                source_info=self._source_info(stmt.lineno)
+            )
+            self._add_signal_edge(signal, edge, "source")
 
 
         if stmt.true_statement:
@@ -266,21 +399,22 @@ class ASTToSTDGBuilder:
     def _handle_nonblocking_assignment(self, stmt: vast.NonblockingSubstitution, base_lineno: int,
                                        condition_logic_id: str = None, condition: str = None):
 
-        logic_id = f"assign_logic_{self.context.logic_block_counter}"
-        self.context.logic_block_counter += 1
+        logic_id = self._next_logic_id("assign_logic", stmt.lineno)
 
         left_signal = self._extract_signal_name(stmt.left)
+        if self.context.assigned_signals is not None:
+            self.context.assigned_signals.append(left_signal)
 
         assign_node = CodeStructureNode(
             node_id=logic_id,
             node_type=NodeType.LOGIC_BLOCK,
             name=f"assign_{left_signal}",
             module_name=self.context.current_module,
-            source_location=f"{self.context.current_source_file}:{stmt.lineno}",
+            source_info=self._source_info(stmt.lineno),
             clock_domain=self.context.current_clock_domain,
             properties={"assignment_type": "nonblocking"}
         )
-        self.graph.add_node(assign_node)
+        self._add_node(assign_node)
 
 
         if condition_logic_id:
@@ -289,62 +423,54 @@ class ASTToSTDGBuilder:
                 target=logic_id,
                 edge_type=EdgeType.CONTROL_FLOW,
                 condition=condition,
-                source_location=f"{self.context.current_source_file}:{stmt.lineno}"
+                source_info=self._source_info(stmt.lineno)
             )
-            self.graph.add_edge(control_edge)
+            self._add_edge(control_edge)
 
 
         right_signals = self._extract_signals_from_expression(stmt.right)
         for signal in right_signals:
-            source_id = self._get_node_id_by_signal(signal)
-            if source_id:
-                edge = CodeStructureEdge(
-                    source=source_id,
-                    target=logic_id,
-                    edge_type=EdgeType.DATA_FLOW,
-                    signal_name=signal,
-                    source_location=f"{self.context.current_source_file}:{stmt.lineno}"
-                )
-                self.graph.add_edge(edge)
-
-
-        target_id = self._get_node_id_by_signal(left_signal)
-        if target_id:
             edge = CodeStructureEdge(
-                source=logic_id,
-                target=target_id,
+                source="",
+                target=logic_id,
                 edge_type=EdgeType.DATA_FLOW,
-                signal_name=left_signal,
-                source_location=f"{self.context.current_source_file}:{stmt.lineno}"
+                signal_name=signal,
+                source_info=self._source_info(stmt.lineno)
             )
-            self.graph.add_edge(edge)
-            print(f"DEBUG: 创建数据流边 {logic_id} -> {target_id} (信号: {left_signal})")
-        else:
-            print(f"DEBUG: 找不到左值信号的目标节点: {left_signal}")
+            self._add_signal_edge(signal, edge, "source")
 
-            possible_ids = [f"reg_{left_signal}", f"port_{left_signal}", f"signal_{left_signal}"]
-            existing_nodes = list(self.graph.nodes.keys())
-            print(f"DEBUG: 可能的节点ID: {possible_ids}")
-            print(f"DEBUG: 现有节点: {existing_nodes}")
+
+        edge = CodeStructureEdge(
+            source=logic_id,
+            target="",
+            edge_type=EdgeType.DATA_FLOW,
+            signal_name=left_signal,
+            source_info=self._source_info(stmt.lineno)
+        )
+        if self._add_signal_edge(left_signal, edge, "target"):
+            logger.debug("创建数据流边 %s -> %s (信号: %s)", logic_id, edge.target, left_signal)
+        else:
+            logger.debug("找不到左值信号的目标节点: %s, 等待声明后补建数据流边", left_signal)
 
     def _handle_blocking_assignment(self, stmt: vast.BlockingSubstitution, base_lineno: int,
                                     condition_logic_id: str = None, condition: str = None):
 
-        logic_id = f"assign_logic_{self.context.logic_block_counter}"
-        self.context.logic_block_counter += 1
+        logic_id = self._next_logic_id("assign_logic", stmt.lineno)
 
         left_signal = self._extract_signal_name(stmt.left)
+        if self.context.assigned_signals is not None:
+            self.context.assigned_signals.append(left_signal)
 
         assign_node = CodeStructureNode(
             node_id=logic_id,
             node_type=NodeType.LOGIC_BLOCK,
             name=f"assign_{left_signal}",
             module_name=self.context.current_module,
-            source_location=f"{self.context.current_source_file}:{stmt.lineno}",
+            source_info=self._source_info(stmt.lineno),
             clock_domain=self.context.current_clock_domain,
             properties={"assignment_type": "blocking"}
         )
-        self.graph.add_node(assign_node)
+        self._add_node(assign_node)
 
 
         if condition_logic_id:
@@ -353,57 +479,81 @@ class ASTToSTDGBuilder:
                 target=logic_id,
                 edge_type=EdgeType.CONTROL_FLOW,
                 condition=condition,
-                source_location=f"{self.context.current_source_file}:{stmt.lineno}"
+                source_info=self._source_info(stmt.lineno)
             )
-            self.graph.add_edge(control_edge)
+            self._add_edge(control_edge)
 
         right_signals = self._extract_signals_from_expression(stmt.right)
         for signal in right_signals:
-            source_id = self._get_node_id_by_signal(signal)
-            if source_id:
-                edge = CodeStructureEdge(
-                    source=source_id,
-                    target=logic_id,
-                    edge_type=EdgeType.DATA_FLOW,
-                    signal_name=signal,
-                    source_location=f"{self.context.current_source_file}:{stmt.lineno}"
-                )
-                self.graph.add_edge(edge)
-
-        target_id = self._get_node_id_by_signal(left_signal)
-        if target_id:
             edge = CodeStructureEdge(
-                source=logic_id,
-                target=target_id,
+                source="",
+                target=logic_id,
                 edge_type=EdgeType.DATA_FLOW,
-                signal_name=left_signal,
-                source_location=f"{self.context.current_source_file}:{stmt.lineno}"
+                signal_name=signal,
+                source_info=self._source_info(stmt.lineno)
             )
-            self.graph.add_edge(edge)
+            self._add_signal_edge(signal, edge, "source")
+
+        edge = CodeStructureEdge(
+            source=logic_id,
+            target="",
+            edge_type=EdgeType.DATA_FLOW,
+            signal_name=left_signal,
+            source_info=self._source_info(stmt.lineno)
+        )
+        self._add_signal_edge(left_signal, edge, "target")
 
     def _handle_instance_list(self, node: vast.InstanceList):
 
         for instance in node.instances:
             if isinstance(instance, vast.Instance):
                 instance_node = CodeStructureNode(
-                    node_id=f"instance_{instance.name}",
+                    node_id=self._scoped_id("instance", instance.name),
                     node_type=NodeType.MODULE,
                     name=instance.name,
                     module_name=instance.module,
-                    source_location=f"{self.context.current_source_file}:{instance.lineno}",
+                    source_info=self._source_info(instance.lineno),
                     properties={"instance_type": instance.module}
                 )
-                self.graph.add_node(instance_node)
-
+                self._add_node(instance_node)
 
-                if instance.portlist:
-                    self._handle_instance_ports(instance)
 
-    def _handle_instance_ports(self, instance: vast.Instance):
+                if self._in_line_range(instance_node.source_info):
+                    self._handle_instance_ports(instance, instance_node.node_id)
 
+    def _handle_instance_ports(self, instance: vast.Instance, instance_id: str):
+        module_instance = ModuleInstance(
+            node_id=instance_id,
+            name=instance.name,
+            module_name=instance.module,
+            parent_module=self.context.current_module
+        )
 
-        pass
+        for position, port_arg in enumerate(instance.portlist or ()):
+            port = port_arg.portname if port_arg.portname is not None else position
+            self._bind_instance_port(module_instance, port)
+            if port_arg.argname is None:
+                continue
+
+            for signal in sorted(self._extract_signals_from_expression(port_arg.argname)):
+                node_id = self._get_node_id_by_signal(signal)
+                if node_id is None:
+                    self._defer(signal, lambda node_id, port=port:
+                                self._bind_instance_port(module_instance, port, node_id))
+                else:
+                    self._bind_instance_port(module_instance, port, node_id)
+
+    def _bind_instance_port(self, module_instance: ModuleInstance, port, node_id: Optional[str] = None):
+        bound = (node_id,) if node_id is not None else ()
+        if isinstance(port, str):
+            module_instance.named_bindings[port] = module_instance.named_bindings.get(port, ()) + bound
+        else:
+            ordered_bindings = list(module_instance.ordered_bindings)
+            ordered_bindings.extend(() for _ in range(port + 1 - len(ordered_bindings)))
+            ordered_bindings[port] += bound
+            module_instance.ordered_bindings = tuple(ordered_bindings)
 
+        self.graph.add_module_instance(module_instance)
 
     def _extract_width_info(self, width_node) -> Tuple[int, Optional[str]]:
         if not width_node:
@@ -461,53 +611,41 @@ class ASTToSTDGBuilder:
             return expr.name
 
 
-        print(f"DEBUG: 无法提取信号名，表达式类型: {type(expr)}")
+        logger.debug("无法提取信号名，表达式类型: %s", type(expr))
         if hasattr(expr, '__dict__'):
-            print(f"DEBUG: 表达式属性: {expr.__dict__}")
+            logger.debug("表达式属性: %s", expr.__dict__)
 
         return "unknown_signal"
 
     def _extract_signals_from_expression(self, expr) -> List[str]:
-        signals = []
-
-        if isinstance(expr, vast.Identifier):
-            signals.append(expr.name)
-        elif isinstance(expr, vast.Lvalue):
-
-            if hasattr(expr, 'var') and isinstance(expr.var, vast.Identifier):
-                signals.append(expr.var.name)
-            elif hasattr(expr, 'children') and expr.children():
-                for child in expr.children():
-                    if child:
-                        signals.extend(self._extract_signals_from_expression(child))
-        elif isinstance(expr, vast.Rvalue):
-
-            if hasattr(expr, 'var') and isinstance(expr.var, vast.Identifier):
-                signals.append(expr.var.name)
-            elif hasattr(expr, 'children') and expr.children():
-                for child in expr.children():
-                    if child:
-                        signals.extend(self._extract_signals_from_expression(child))
-        elif isinstance(expr, vast.Partselect):
-            if isinstance(expr.var, vast.Identifier):
-                signals.append(expr.var.name)
-        elif isinstance(expr, vast.Pointer):
-            if isinstance(expr.var, vast.Identifier):
-                signals.append(expr.var.name)
-        elif isinstance(expr, vast.IntConst):
-
-            pass
-        elif hasattr(expr, 'children') and expr.children:
-            for child in expr.children():
-                if child:
-                    signals.extend(self._extract_signals_from_expression(child))
-        elif hasattr(expr, 'name'):
-            signals.append(expr.name)
-        else:
-
-            print(f"DEBUG: 未识别的表达式类型: {type(expr)}")
-
-        return list(set(signals))
+        signals = set()
+        pending = [expr]
+
+        while pending:
+            expr = pending.pop()
+            if isinstance(expr, vast.Identifier):
+                signals.add(expr.name)
+            elif isinstance(expr, (vast.Lvalue, vast.Rvalue)):
+
+                if hasattr(expr, 'var') and isinstance(expr.var, vast.Identifier):
+                    signals.add(expr.var.name)
+                elif hasattr(expr, 'children') and expr.children():
+                    pending.extend(child for child in expr.children() if child)
+            elif isinstance(expr, (vast.Partselect, vast.Pointer)):
+                if isinstance(expr.var, vast.Identifier):
+                    signals.add(expr.var.name)
+            elif isinstance(expr, vast.IntConst):
+
+                pass
+            elif hasattr(expr, 'children') and expr.children:
+                pending.extend(child for child in expr.children() if child)
+            elif hasattr(expr, 'name'):
+                signals.add(expr.name)
+            else:
+
+                logger.debug("未识别的表达式类型: %s", type(expr))
+
+        return list(signals)
 
     def _expression_to_string(self, expr) -> str:
         if isinstance(expr, vast.Identifier):
@@ -527,24 +665,21 @@ class ASTToSTDGBuilder:
         return "complex_expr"
 
     def _get_node_id_by_signal(self, signal_name: str) -> Optional[str]:
+        symbols = self._symbols.get(self.context.current_module)
+        if symbols is None:
+            return None
 
-        possible_ids = [
-            f"reg_{signal_name}",
-            f"port_{signal_name}",
-            f"signal_{signal_name}"
-        ]
-
-        for node_id in possible_ids:
-            if node_id in self.graph.nodes:
-                return node_id
+        symbol = symbols.get(signal_name)
+        return symbol[1] if symbol is not None else None
 
-        return None
+    def _update_register_clock_domain(self, signal_name: str, clock_signal: str):
+        def assign(node_id: str):
+            node = self.graph.nodes.get(node_id)
+            if node is not None and node.node_type == NodeType.REGISTER and node.clock_domain is None:
+                self.graph.set_node_clock_domain(node_id, clock_signal)
 
-    def _update_registers_clock_domain(self, clock_signal: str):
-        if not clock_signal:
-            return
-
-        for node_id, node in self.graph.nodes.items():
-            if (node.node_type == NodeType.REGISTER and
-                    node.clock_domain is None):
-                node.clock_domain = clock_signal
\ No newline at end of file
+        node_id = self._get_node_id_by_signal(signal_name)
+        if node_id is None:
+            self._defer(signal_name, assign)
+        else:
+            assign(node_id)
@@ -0,0 +1,57 @@
+from typing import Any, Callable, Dict, Hashable, Iterator, Mapping, Optional
+
+
+class AttributeIndex:
+
+    def __init__(self, key_functions: Mapping[str, Callable[[Any], Hashable]]):
+        self._key_functions = dict(key_functions)
+        self._buckets: Dict[str, Dict[Hashable, Dict[Hashable, None]]] = {
+            attribute: {} for attribute in self._key_functions
+        }
+
+    def __contains__(self, attribute: str) -> bool:
+        return attribute in self._key_functions
+
+    def add(self, key: Hashable, item: Any):
+        for attribute, key_function in self._key_functions.items():
+            self._buckets[attribute].setdefault(key_function(item), {})[key] = None
+
+    def add_values(self, key: Hashable, values: Mapping[str, Hashable]):
+        for attribute in self._key_functions:
+            self._buckets[attribute].setdefault(values[attribute], {})[key] = None
+
+    def discard(self, key: Hashable, item: Any):
+        for attribute, key_function in self._key_functions.items():
+            buckets = self._buckets[attribute]
+            value = key_function(item)
+            members = buckets.get(value)
+            if members is not None:
+                members.pop(key, None)
+                if not members:
+                    del buckets[value]
+
+    def buckets(self, attribute: str) -> Dict[Hashable, Dict[Hashable, None]]:
+        return self._buckets[attribute]
+
+    def bucket(self, attribute: str, value: Hashable) -> Mapping[Hashable, None]:
+        return self._buckets[attribute].get(value, {})
+
+    def candidates(self, criteria: Mapping[str, Any]) -> Optional[Iterator[Hashable]]:
+        indexed = [self.bucket(attribute, value) for attribute, value in criteria.items()
+                   if attribute in self._key_functions]
+        if not indexed:
+            return None
+
+        indexed.sort(key=len)
+        smallest, others = indexed[0], indexed[1:]
+        return (key for key in tuple(smallest) if all(key in members for members in others))
+
+
+def attribute_value(item: Any, attribute: str) -> Any:
+    if hasattr(item, attribute):
+        return getattr(item, attribute)
+    return item.properties.get(attribute)
+
+
+def matches(item: Any, criteria: Mapping[str, Any]) -> bool:
+    return all(attribute_value(item, attribute) == value for attribute, value in criteria.items())
@@ -0,0 +1,89 @@
+import sys
+import time
+import pyverilog.vparser.ast as vast
+from pyverilog.vparser.parser import VerilogParser
+from ast2stdg import ASTToSTDGBuilder
+
+
+class LegacyASTToSTDGBuilder(ASTToSTDGBuilder):
+
+    def _visit_node(self, node: vast.Node):
+        if isinstance(node, vast.ModuleDef):
+            self._handle_module_def(node)
+        elif isinstance(node, vast.Decl):
+            self._handle_declaration(node)
+        elif isinstance(node, vast.Assign):
+            self._handle_assign(node)
+        elif isinstance(node, vast.Always):
+            self._handle_always_block(node)
+        elif isinstance(node, vast.InstanceList):
+            self._handle_instance_list(node)
+
+
+        if hasattr(node, 'children') and node.children:
+            for child in node.children():
+                if child:
+                    self._visit_node(child)
+
+
+def generate_flat_netlist(cell_count: int, fanin: int = 8, chain_depth: int = 0) -> str:
+    lines = ["module flat_top(input clk, input [7:0] din, output [7:0] dout);"]
+    for i in range(cell_count):
+        lines.append(f"  reg [7:0] r{i};")
+        lines.append(f"  wire [7:0] w{i};")
+
+    lines.append("  assign w0 = din;")
+    for i in range(1, cell_count):
+        terms = " ^ ".join(f"(r{(i - k) % cell_count} & w{i - 1})" for k in range(1, fanin + 1))
+        lines.append(f"  assign w{i} = {terms} ^ din;")
+
+    lines.append("  always @(posedge clk) begin")
+    for i in range(cell_count):
+        lines.append(f"    r{i} = w{i};")
+    lines.append("  end")
+
+    if chain_depth:
+        chain = " + ".join(f"r{i % cell_count}" for i in range(chain_depth))
+        lines.append(f"  assign dout = {chain};")
+    else:
+        lines.append(f"  assign dout = r{cell_count - 1};")
+
+    lines.append("endmodule")
+    return "\n".join(lines) + "\n"
+
+
+def measure(builder_cls, ast, repeat: int):
+    best = None
+    for _ in range(repeat):
+        builder = builder_cls()
+        start = time.perf_counter()
+        try:
+            builder.build_from_ast(ast, "flat_top.v")
+        except RecursionError:
+            return None, 0
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(builder.graph.nodes)
+
+
+def run_benchmark(cell_count: int = 2000, fanin: int = 8, chain_depth: int = 0, repeat: int = 3):
+    ast = VerilogParser().parse(generate_flat_netlist(cell_count, fanin, chain_depth))
+
+    print(f"单元数量: {cell_count}, 扇入: {fanin}, 表达式链深度: {chain_depth}")
+    results = {}
+    for label, builder_cls in (("递归遍历(旧)", LegacyASTToSTDGBuilder), ("显式栈遍历", ASTToSTDGBuilder)):
+        elapsed, node_count = measure(builder_cls, ast, repeat)
+        results[label] = elapsed
+        if elapsed is None:
+            print(f"  {label}: 超出递归深度限制 ({sys.getrecursionlimit()})")
+        else:
+            print(f"  {label}: {elapsed * 1000:.1f} ms, 节点数 {node_count}")
+
+    legacy, current = results.values()
+    if legacy is not None and current is not None:
+        print(f"  加速比: {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark()
+    run_benchmark(cell_count=200, chain_depth=2000, repeat=1)
@@ -0,0 +1,98 @@
+import time
+import tracemalloc
+from dataclasses import MISSING, fields, make_dataclass, field
+from stdg import (
+    CodeStructureNode, CodeStructureEdge, SourceCodeInfo, ViolationInfo,
+    NodeType, EdgeType
+)
+
+
+def _unslotted_copy(cls, post_init=None):
+    spec = []
+    for f in fields(cls):
+        if f.default is MISSING:
+            spec.append((f.name, f.type))
+        else:
+            spec.append((f.name, f.type, field(default=f.default)))
+
+    namespace = {'__post_init__': post_init} if post_init else {}
+    return make_dataclass(f"Legacy{cls.__name__}", spec, namespace=namespace)
+
+
+LegacySourceCodeInfo = _unslotted_copy(SourceCodeInfo)
+LegacyViolationInfo = _unslotted_copy(ViolationInfo)
+
+
+def _legacy_node_post_init(self):
+    if self.violation_info is None:
+        self.violation_info = LegacyViolationInfo()
+    if self.properties is None:
+        self.properties = {}
+    if self.assignment_sources is None:
+        self.assignment_sources = []
+    if self.source_info is None:
+        self.source_info = LegacySourceCodeInfo()
+
+    if self.signal_width is not None and self.signal_width > 1:
+        self.is_multi_bit = True
+
+
+def _legacy_edge_post_init(self):
+    if self.properties is None:
+        self.properties = {}
+    if self.source_info is None:
+        self.source_info = LegacySourceCodeInfo()
+
+    if (self.crosses_clock_domain and
+            self.signal_width is not None and
+            self.signal_width > 1):
+        self.is_multi_bit_cdc = True
+
+
+LegacyCodeStructureNode = _unslotted_copy(CodeStructureNode, _legacy_node_post_init)
+LegacyCodeStructureEdge = _unslotted_copy(CodeStructureEdge, _legacy_edge_post_init)
+
+
+def _build_nodes(node_cls, count):
+    return [node_cls(node_id=f"reg_{i}", node_type=NodeType.REGISTER, name=f"r{i}",
+                     signal_name=f"r{i}", signal_width=8, clock_domain="clk")
+            for i in range(count)]
+
+
+def _build_edges(edge_cls, count):
+    return [edge_cls(source=f"reg_{i}", target=f"reg_{i + 1}", edge_type=EdgeType.DATA_FLOW)
+            for i in range(count)]
+
+
+def measure(builder, cls, count):
+    start = time.perf_counter()
+    objects = builder(cls, count)
+    elapsed = time.perf_counter() - start
+    del objects
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    objects = builder(cls, count)
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    del objects
+    return used / count, elapsed / count * 1e9
+
+
+def run_benchmark(count: int = 200000):
+    cases = [
+        ("节点(旧)", _build_nodes, LegacyCodeStructureNode),
+        ("节点(slots)", _build_nodes, CodeStructureNode),
+        ("边(旧)", _build_edges, LegacyCodeStructureEdge),
+        ("边(slots)", _build_edges, CodeStructureEdge),
+    ]
+
+    print(f"对象数量: {count}")
+    for label, builder, cls in cases:
+        bytes_per_object, ns_per_object = measure(builder, cls, count)
+        print(f"  {label}: {bytes_per_object:.1f} 字节/个, 构造 {ns_per_object:.0f} ns/个")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,281 @@
+from array import array
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+import networkx as nx
+
+
+def build_csr(node_count: int, keys: Sequence[int], values: Sequence[int]) -> Tuple[array, array]:
+    offsets = array('i', bytes(4 * (node_count + 1)))
+    for key in keys:
+        offsets[key + 1] += 1
+    for i in range(node_count):
+        offsets[i + 1] += offsets[i]
+
+    cursor = array('i', offsets[:node_count])
+    neighbors = array('i', bytes(4 * len(values)))
+    for key, value in zip(keys, values):
+        neighbors[cursor[key]] = value
+        cursor[key] += 1
+
+    return offsets, neighbors
+
+
+class _NeighborView:
+
+    def __init__(self, compact: 'CompactGraph', forward: bool):
+        self._compact = compact
+        self._forward = forward
+
+    def __getitem__(self, node_id: str) -> List[str]:
+        index = self._compact.index[node_id]
+        node_ids = self._compact.node_ids
+        return [node_ids[i] for i in self._compact.neighbors(index, self._forward)]
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._compact
+
+    def __iter__(self) -> Iterator[str]:
+        return self._compact.iter_node_ids()
+
+    def __len__(self) -> int:
+        return len(self._compact)
+
+
+class _RowNeighborView:
+
+    def __init__(self, compact: 'CompactGraph', forward: bool):
+        self._compact = compact
+        self._forward = forward
+
+    def __getitem__(self, index: int) -> List[int]:
+        return self._compact.neighbors(index, self._forward)
+
+
+class CompactGraph:
+
+    NO_VALUE = -1
+    MIN_CSR_TAIL = 1024
+
+    def __init__(self):
+        self.node_ids: List[str] = []
+        self.index: Dict[str, int] = {}
+
+        self.node_type = array('b')
+        self.clock_domain = array('i')
+        self.width = array('i')
+        self.domain_names: List[str] = []
+        self._domain_ids: Dict[str, int] = {}
+
+        self.edge_sources = array('i')
+        self.edge_targets = array('i')
+
+        self._succ_csr: Optional[Tuple[array, array]] = None
+        self._pred_csr: Optional[Tuple[array, array]] = None
+        self._csr_edge_count = 0
+        self._tail_succ: Dict[int, List[int]] = {}
+        self._tail_pred: Dict[int, List[int]] = {}
+        self._removed_edges: Set[Tuple[int, int]] = set()
+        self._removed_nodes: Set[int] = set()
+        self._mapped = False
+
+        self.succ = _NeighborView(self, forward=True)
+        self.pred = _NeighborView(self, forward=False)
+        self.succ_rows = _RowNeighborView(self, forward=True)
+        self.pred_rows = _RowNeighborView(self, forward=False)
+
+    @classmethod
+    def from_columns(cls, node_ids: Sequence[str], index: Mapping[str, int],
+                     node_type: Sequence[int], clock_domain: Sequence[int], width: Sequence[int],
+                     domain_names: List[str], edge_sources: Sequence[int], edge_targets: Sequence[int],
+                     succ_csr: Tuple[Sequence[int], Sequence[int]],
+                     pred_csr: Tuple[Sequence[int], Sequence[int]]) -> 'CompactGraph':
+        compact = cls()
+        compact.node_ids = node_ids
+        compact.index = index
+        compact.node_type = node_type
+        compact.clock_domain = clock_domain
+        compact.width = width
+        compact.domain_names = list(domain_names)
+        compact._domain_ids = {name: i for i, name in enumerate(compact.domain_names)}
+        compact.edge_sources = edge_sources
+        compact.edge_targets = edge_targets
+        compact._succ_csr = succ_csr
+        compact._pred_csr = pred_csr
+        compact._csr_edge_count = len(edge_sources)
+        compact._mapped = True
+        return compact
+
+    def _thaw(self):
+        if not self._mapped:
+            return
+
+        self.node_ids = list(self.node_ids)
+        self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.node_type = array('b', self.node_type)
+        self.clock_domain = array('i', self.clock_domain)
+        self.width = array('i', self.width)
+        self.edge_sources = array('i', self.edge_sources)
+        self.edge_targets = array('i', self.edge_targets)
+        self._mapped = False
+
+    def __len__(self) -> int:
+        return len(self.node_ids) - len(self._removed_nodes)
+
+    def __contains__(self, node_id: str) -> bool:
+        index = self.index.get(node_id)
+        return index is not None and index not in self._removed_nodes
+
+    def iter_node_ids(self) -> Iterator[str]:
+        if not self._removed_nodes:
+            return iter(self.node_ids)
+        return (node_id for index, node_id in enumerate(self.node_ids) if index not in self._removed_nodes)
+
+    def iter_rows(self) -> Iterator[int]:
+        if not self._removed_nodes:
+            return iter(range(len(self.node_ids)))
+        return (index for index in range(len(self.node_ids)) if index not in self._removed_nodes)
+
+    def source_rows(self) -> List[int]:
+        node_type = self.node_type
+        return [index for index in self.iter_rows()
+                if node_type[index] != self.NO_VALUE and not self.neighbors(index, forward=False)]
+
+    def intern(self, node_id: str) -> int:
+        index = self.index.get(node_id)
+        if index is not None:
+            self._removed_nodes.discard(index)
+        else:
+            self._thaw()
+            index = len(self.node_ids)
+            self.index[node_id] = index
+            self.node_ids.append(node_id)
+            self.node_type.append(self.NO_VALUE)
+            self.clock_domain.append(self.NO_VALUE)
+            self.width.append(self.NO_VALUE)
+        return index
+
+    def domain_id(self, clock_domain: Optional[str]) -> int:
+        if clock_domain is None:
+            return self.NO_VALUE
+        domain_id = self._domain_ids.get(clock_domain)
+        if domain_id is None:
+            domain_id = len(self.domain_names)
+            self._domain_ids[clock_domain] = domain_id
+            self.domain_names.append(clock_domain)
+        return domain_id
+
+    def add_node(self, node_id: str, node_type: int, clock_domain: Optional[str] = None,
+                 width: Optional[int] = None) -> int:
+        index = self.intern(node_id)
+        self.node_type[index] = node_type
+        self.clock_domain[index] = self.domain_id(clock_domain)
+        self.width[index] = self.NO_VALUE if width is None else width
+        return index
+
+    def set_clock_domain(self, node_id: str, clock_domain: Optional[str]):
+        self.clock_domain[self.intern(node_id)] = self.domain_id(clock_domain)
+
+    def get_clock_domain(self, node_id: str) -> Optional[str]:
+        domain_id = self.clock_domain[self.index[node_id]]
+        return None if domain_id == self.NO_VALUE else self.domain_names[domain_id]
+
+    def add_edge(self, source: str, target: str):
+        self._thaw()
+        source_index = self.intern(source)
+        target_index = self.intern(target)
+        if (source_index, target_index) in self._removed_edges:
+            self._removed_edges.discard((source_index, target_index))
+            return
+
+        self.edge_sources.append(source_index)
+        self.edge_targets.append(target_index)
+
+        if self._succ_csr is not None:
+            self._tail_succ.setdefault(source_index, []).append(target_index)
+            self._tail_pred.setdefault(target_index, []).append(source_index)
+
+    def remove_edge(self, source: str, target: str):
+        self._removed_edges.add((self.index[source], self.index[target]))
+
+    def remove_node(self, node_id: str):
+        index = self.index[node_id]
+        for target_index in self.neighbors(index, forward=True):
+            self._removed_edges.add((index, target_index))
+        for source_index in self.neighbors(index, forward=False):
+            self._removed_edges.add((source_index, index))
+
+        self.node_type[index] = self.NO_VALUE
+        self.clock_domain[index] = self.NO_VALUE
+        self.width[index] = self.NO_VALUE
+        self._removed_nodes.add(index)
+
+    def number_of_edges(self) -> int:
+        return len(self.edge_sources) - len(self._removed_edges)
+
+    def _drop_removed_edges(self):
+        self._thaw()
+        removed = self._removed_edges
+        kept = [(s, t) for s, t in zip(self.edge_sources, self.edge_targets) if (s, t) not in removed]
+        self.edge_sources = array('i', (s for s, _ in kept))
+        self.edge_targets = array('i', (t for _, t in kept))
+        self._removed_edges = set()
+
+    def _refresh_csr(self, force: bool = False):
+        edge_count = len(self.edge_sources)
+        stale = edge_count - self._csr_edge_count + len(self._removed_edges)
+        if self._succ_csr is not None and not force and stale <= max(self.MIN_CSR_TAIL, edge_count // 4):
+            return
+
+        if self._removed_edges:
+            self._drop_removed_edges()
+            edge_count = len(self.edge_sources)
+
+        self._succ_csr = build_csr(len(self.node_ids), self.edge_sources, self.edge_targets)
+        self._pred_csr = build_csr(len(self.node_ids), self.edge_targets, self.edge_sources)
+        self._csr_edge_count = edge_count
+        self._tail_succ = {}
+        self._tail_pred = {}
+
+    def csr(self, forward: bool = True) -> Tuple[array, array]:
+        if (self._succ_csr is None or
+                self._removed_edges or
+                self._csr_edge_count != len(self.edge_sources) or
+                len(self._succ_csr[0]) != len(self.node_ids) + 1):
+            self._refresh_csr(force=True)
+        return self._succ_csr if forward else self._pred_csr
+
+    def neighbors(self, index: int, forward: bool = True) -> List[int]:
+        self._refresh_csr()
+        offsets, packed = self._succ_csr if forward else self._pred_csr
+
+        result = []
+        if index + 1 < len(offsets):
+            result.extend(packed[offsets[index]:offsets[index + 1]])
+
+        tail = (self._tail_succ if forward else self._tail_pred).get(index)
+        if tail:
+            result.extend(tail)
+
+        if self._removed_edges:
+            removed = self._removed_edges
+            if forward:
+                result = [target for target in result if (index, target) not in removed]
+            else:
+                result = [source for source in result if (source, index) not in removed]
+
+        return result
+
+    def in_degree(self, node_id: str) -> int:
+        return len(self.neighbors(self.index[node_id], forward=False))
+
+    def out_degree(self, node_id: str) -> int:
+        return len(self.neighbors(self.index[node_id], forward=True))
+
+    def to_networkx(self) -> nx.DiGraph:
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.iter_node_ids())
+        node_ids = self.node_ids
+        removed = self._removed_edges
+        graph.add_edges_from((node_ids[s], node_ids[t])
+                             for s, t in zip(self.edge_sources, self.edge_targets)
+                             if (s, t) not in removed)
+        return graph
@@ -0,0 +1,111 @@
+from collections import deque
+from typing import Container, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Set
+
+from path_search import strongly_connected_components
+
+
+class Condensation:
+
+    def __init__(self, successors: Mapping[Hashable, Iterable[Hashable]], nodes: Iterable[Hashable],
+                 within: Optional[Container[Hashable]] = None, labels: Optional[Sequence[Hashable]] = None,
+                 labeled_successors: Optional[Mapping[Hashable, Iterable[Hashable]]] = None):
+        components = strongly_connected_components(successors, nodes, within)
+        components.reverse()
+
+        component_of: Dict[Hashable, int] = {}
+        for component, component_members in enumerate(components):
+            for member in component_members:
+                component_of[member] = component
+
+        self.succ: List[List[int]] = [[] for _ in components]
+        self.pred: List[List[int]] = [[] for _ in components]
+        self._cyclic: List[bool] = [len(component_members) > 1 for component_members in components]
+
+        for component, component_members in enumerate(components):
+            linked = {}
+            for member in component_members:
+                for child in successors[member]:
+                    child_component = component_of.get(child)
+                    if child_component is None:
+                        continue
+                    if child_component == component:
+                        self._cyclic[component] = True
+                    elif child_component not in linked:
+                        linked[child_component] = None
+                        self.succ[component].append(child_component)
+                        self.pred[child_component].append(component)
+
+        if labels is None:
+            self._successors = successors
+            self.members: List[List[Hashable]] = components
+            self.component_of: Dict[Hashable, int] = component_of
+        else:
+            self._successors = labeled_successors
+            self.members = [[labels[member] for member in component_members] for component_members in components]
+            self.component_of = {member: component for component, component_members in enumerate(self.members)
+                                 for member in component_members}
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self.component_of
+
+    def is_cyclic(self, component: int) -> bool:
+        return self._cyclic[component]
+
+    def ancestors(self, component: int) -> Set[int]:
+        reaching = {component}
+        stack = [component]
+        while stack:
+            current = stack.pop()
+            for pred in self.pred[current]:
+                if pred not in reaching:
+                    reaching.add(pred)
+                    stack.append(pred)
+        return reaching
+
+    def _route_within(self, component: int, start: Hashable, is_goal) -> Optional[List[Hashable]]:
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if is_goal(node):
+                route = []
+                while node is not None:
+                    route.append(node)
+                    node = parents[node]
+                route.reverse()
+                return route
+
+            for child in self._successors[node]:
+                if child not in parents and self.component_of.get(child) == component:
+                    parents[child] = node
+                    queue.append(child)
+        return None
+
+    def expand_path(self, component_path: List[int], start: Hashable, target: Hashable) -> Optional[List[Hashable]]:
+        path = []
+        current = start
+
+        for position, component in enumerate(component_path):
+            if position + 1 == len(component_path):
+                route = self._route_within(component, current, lambda node: node == target)
+                if route is None:
+                    return None
+                path.extend(route)
+                break
+
+            next_component = component_path[position + 1]
+
+            def leaves_component(node: Hashable) -> bool:
+                return any(self.component_of.get(child) == next_component for child in self._successors[node])
+
+            route = self._route_within(component, current, leaves_component)
+            if route is None:
+                return None
+            path.extend(route)
+            current = next(child for child in self._successors[route[-1]]
+                           if self.component_of.get(child) == next_component)
+
+        return path
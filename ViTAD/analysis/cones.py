@@ -0,0 +1,56 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+
+FANIN = "fanin"
+FANOUT = "fanout"
+
+
+@dataclass(slots=True)
+class LogicCone:
+    root: Hashable
+    direction: str
+    max_depth: Optional[int]
+    nodes: Tuple[Hashable, ...]
+    edges: Tuple[Tuple[Hashable, Hashable], ...]
+    boundary: Tuple[Hashable, ...]
+    depth_of: Mapping[Hashable, int]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self.depth_of
+
+    def nodes_at_depth(self, depth: int) -> List[Hashable]:
+        return [node for node in self.nodes if self.depth_of[node] == depth]
+
+
+def extract_cone(neighbors: Mapping[Hashable, Iterable[Hashable]], root: Hashable, direction: str,
+                 max_depth: Optional[int] = None,
+                 is_boundary: Optional[Callable[[Hashable], bool]] = None) -> LogicCone:
+    depth_of: Dict[Hashable, int] = {root: 0}
+    order = [root]
+    edges = []
+    boundary = []
+    queue = deque([root])
+
+    while queue:
+        node = queue.popleft()
+        depth = depth_of[node]
+        if node != root and is_boundary is not None and is_boundary(node):
+            boundary.append(node)
+            continue
+        if max_depth is not None and depth >= max_depth:
+            continue
+
+        for neighbor in neighbors[node]:
+            edges.append((neighbor, node) if direction == FANIN else (node, neighbor))
+            if neighbor not in depth_of:
+                depth_of[neighbor] = depth + 1
+                order.append(neighbor)
+                queue.append(neighbor)
+
+    return LogicCone(root=root, direction=direction, max_depth=max_depth, nodes=tuple(order),
+                     edges=tuple(edges), boundary=tuple(boundary), depth_of=depth_of)
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+
+HIERARCHY_SEPARATOR = "/"
+
+HierarchicalNode = Tuple[Tuple[str, ...], str]
+
+
+@dataclass(slots=True)
+class ModuleTemplate:
+    module_name: str
+    node_id: str
+    ports: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ModuleInstance:
+    node_id: str
+    name: str
+    module_name: str
+    parent_module: str
+    named_bindings: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    ordered_bindings: Tuple[Tuple[str, ...], ...] = ()
+
+    def port_bindings(self, template: ModuleTemplate) -> Dict[str, Tuple[str, ...]]:
+        bindings = dict(zip(template.ports, self.ordered_bindings))
+        bindings.update(self.named_bindings)
+        return bindings
+
+
+def format_hierarchical_node(node: HierarchicalNode) -> str:
+    instance_path, node_id = node
+    return HIERARCHY_SEPARATOR.join(instance_path + (node_id,))
+
+
+def parse_hierarchical_node(name: str) -> HierarchicalNode:
+    *instance_path, node_id = name.split(HIERARCHY_SEPARATOR)
+    return tuple(instance_path), node_id
+
+
+def top_modules(templates: Mapping[str, ModuleTemplate], instances: Iterable[ModuleInstance]) -> List[str]:
+    instantiated = {instance.module_name for instance in instances}
+    return [module_name for module_name in templates if module_name not in instantiated]
+
+
+class HierarchicalView:
+
+    def __init__(self, successors: Mapping[Hashable, Iterable[Hashable]], module_of: Callable[[str], Optional[str]],
+                 port_direction: Callable[[str], Optional[str]], templates: Mapping[str, ModuleTemplate],
+                 instances: Iterable[ModuleInstance], top: str):
+        self._successors = successors
+        self._module_of = module_of
+        self.top = top
+
+        self._children: Dict[Tuple[str, str], ModuleInstance] = {}
+        self._downward: Dict[str, Dict[str, List[Tuple[str, str]]]] = {}
+        self._upward: Dict[Tuple[str, str], Dict[str, Tuple[str, ...]]] = {}
+
+        for instance in instances:
+            template = templates.get(instance.module_name)
+            if template is None:
+                continue
+            self._children[(instance.parent_module, instance.name)] = instance
+
+            downward = self._downward.setdefault(instance.parent_module, {})
+            upward = self._upward.setdefault((instance.parent_module, instance.name), {})
+            for port_name, parent_ids in instance.port_bindings(template).items():
+                port_id = template.ports.get(port_name)
+                direction = port_direction(port_id) if port_id is not None else None
+                if direction is None:
+                    continue
+                if direction in ("input", "inout"):
+                    for parent_id in parent_ids:
+                        downward.setdefault(parent_id, []).append((instance.name, port_id))
+                if direction in ("output", "inout"):
+                    upward[port_id] = parent_ids
+
+        self.module_at = lru_cache(maxsize=4096)(self._module_at)
+
+    def _module_at(self, instance_path: Tuple[str, ...]) -> Optional[str]:
+        module_name = self.top
+        for instance_name in instance_path:
+            instance = self._children.get((module_name, instance_name))
+            if instance is None:
+                return None
+            module_name = instance.module_name
+        return module_name
+
+    def __contains__(self, node: HierarchicalNode) -> bool:
+        instance_path, node_id = node
+        module_name = self.module_at(instance_path)
+        return module_name is not None and self._module_of(node_id) == module_name
+
+    def instances_of(self, module_name: str) -> List[ModuleInstance]:
+        return [instance for (parent_module, _), instance in self._children.items()
+                if parent_module == module_name]
+
+    def __getitem__(self, node: HierarchicalNode) -> List[HierarchicalNode]:
+        instance_path, node_id = node
+        module_name = self.module_at(instance_path)
+
+        successors = [(instance_path, child) for child in self._successors[node_id]
+                      if self._module_of(child) == module_name]
+
+        for instance_name, port_id in self._downward.get(module_name, {}).get(node_id, ()):
+            successors.append((instance_path + (instance_name,), port_id))
+
+        if instance_path:
+            parent_path = instance_path[:-1]
+            parent_ids = self._upward.get((self.module_at(parent_path), instance_path[-1]), {}).get(node_id, ())
+            successors.extend((parent_path, parent_id) for parent_id in parent_ids)
+
+        return successors
+
+    def successors(self, node: HierarchicalNode) -> List[HierarchicalNode]:
+        return self[node]
+
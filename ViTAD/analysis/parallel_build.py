@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+import tempfile
+import zlib
+from dataclasses import dataclass, fields
+from functools import partial
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import pyverilog.vparser.ast as vast
+from pyverilog.vparser.parser import VerilogCodeParser
+
+from ast2stdg import BUILDER_VERSION, ASTToSTDGBuilder
+from hierarchy import ModuleInstance, ModuleTemplate
+from parallel_search import fork_available, resolve_worker_count
+from parse_cache import ParseCache
+from stdg import CodeStructureEdge, CodeStructureGraph, CodeStructureNode
+from stdg_store import SCHEMA_FINGERPRINT
+
+
+_WORKER_PARSER: Optional[Callable[[str], vast.Node]] = None
+_WORKER_CACHE: Optional[Tuple[ParseCache, Optional[Sequence[str]], Optional[Sequence[str]]]] = None
+
+
+@dataclass(slots=True)
+class FileBuildResult:
+    source_file: str
+    nodes: List[CodeStructureNode]
+    edges: List[CodeStructureEdge]
+    module_templates: List[ModuleTemplate]
+    module_instances: List[ModuleInstance]
+
+
+def _fragment_fingerprint() -> str:
+    parts = [BUILDER_VERSION, SCHEMA_FINGERPRINT]
+    for cls in (FileBuildResult, ModuleTemplate, ModuleInstance):
+        parts.append(tuple(f.name for f in fields(cls)))
+    return f"{zlib.crc32(repr(parts).encode('utf-8')):08x}"
+
+
+FRAGMENT_FINGERPRINT = _fragment_fingerprint()
+
+
+def parse_verilog_file(file_path: str, include: Optional[Sequence[str]] = None,
+                       define: Optional[Sequence[str]] = None) -> vast.Node:
+    fd, preprocess_output = tempfile.mkstemp(prefix="stdg_pp_", suffix=".v")
+    os.close(fd)
+    try:
+        parser = VerilogCodeParser([file_path], preprocess_output=preprocess_output,
+                                   preprocess_include=include, preprocess_define=define, debug=False)
+        return parser.parse()
+    finally:
+        os.remove(preprocess_output)
+
+
+def build_file(file_path: str, parser: Callable[[str], vast.Node]) -> FileBuildResult:
+    graph = ASTToSTDGBuilder().build_from_ast(parser(file_path), file_path)
+    return FileBuildResult(
+        source_file=file_path,
+        nodes=list(graph.nodes.values()),
+        edges=list(graph.edges.values()),
+        module_templates=list(graph.module_templates.values()),
+        module_instances=list(graph.module_instances.values())
+    )
+
+
+def build_file_cached(file_path: str, parser: Callable[[str], vast.Node], parse_cache: Optional[ParseCache],
+                      include: Optional[Sequence[str]] = None,
+                      define: Optional[Sequence[str]] = None) -> FileBuildResult:
+    if parse_cache is None:
+        return build_file(file_path, parser)
+
+    key = parse_cache.key_for_file(f"stdg:{FRAGMENT_FINGERPRINT}:{file_path}", file_path, include, define)
+    return parse_cache.get_or_create(key, lambda: build_file(file_path, parser))
+
+
+def _build_file_in_worker(file_path: str) -> FileBuildResult:
+    parse_cache, include, define = _WORKER_CACHE
+    return build_file_cached(file_path, _WORKER_PARSER, parse_cache, include, define)
+
+
+def build_files_in_pool(file_paths: Sequence[str], parser: Callable[[str], vast.Node], workers: int,
+                        parse_cache: Optional[ParseCache] = None, include: Optional[Sequence[str]] = None,
+                        define: Optional[Sequence[str]] = None) -> List[FileBuildResult]:
+    global _WORKER_PARSER, _WORKER_CACHE
+
+    _WORKER_PARSER = parser
+    _WORKER_CACHE = (parse_cache, include, define)
+    try:
+        context = multiprocessing.get_context('fork')
+        with context.Pool(processes=min(workers, len(file_paths))) as pool:
+            return list(pool.imap(_build_file_in_worker, file_paths, chunksize=1))
+    finally:
+        _WORKER_PARSER = None
+        _WORKER_CACHE = None
+
+
+def build_graph_from_files(file_paths: Sequence[str], workers: Optional[int] = None,
+                           include: Optional[Sequence[str]] = None, define: Optional[Sequence[str]] = None,
+                           compact: bool = False,
+                           parser: Optional[Callable[[str], vast.Node]] = None,
+                           parse_cache: Optional[ParseCache] = None) -> CodeStructureGraph:
+    if parser is None:
+        parser = partial(parse_verilog_file, include=include, define=define)
+
+    file_paths = list(dict.fromkeys(file_paths))
+    worker_count = resolve_worker_count(workers)
+    if worker_count > 1 and len(file_paths) > 1 and fork_available():
+        results = build_files_in_pool(file_paths, parser, worker_count, parse_cache, include, define)
+    else:
+        results = (build_file_cached(file_path, parser, parse_cache, include, define) for file_path in file_paths)
+
+
+    graph = CodeStructureGraph(compact=compact)
+    for result in results:
+        graph.merge(result.nodes, result.edges, result.module_templates, result.module_instances)
+        if os.path.isfile(result.source_file):
+            graph.add_source_file(result.source_file)
+
+    return graph
@@ -0,0 +1,40 @@
+import multiprocessing
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+
+_WORKER_GRAPH = None
+_WORKER_SEARCH_OPTIONS: Dict[str, Any] = {}
+
+
+def resolve_worker_count(workers: Optional[int]) -> int:
+    if workers is None:
+        return 1
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def fork_available() -> bool:
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def _search_register(violation_register: str) -> List[Dict]:
+    return _WORKER_GRAPH.find_full_execution_paths_to_violation(violation_register, **_WORKER_SEARCH_OPTIONS)
+
+
+def search_registers_in_pool(graph, violation_registers: Sequence[str], search_options: Dict[str, Any],
+                             workers: int) -> List[List[Dict]]:
+    global _WORKER_GRAPH, _WORKER_SEARCH_OPTIONS
+
+    graph.freeze_for_search()
+    _WORKER_GRAPH = graph
+    _WORKER_SEARCH_OPTIONS = dict(search_options)
+
+    try:
+        context = multiprocessing.get_context('fork')
+        with context.Pool(processes=min(workers, len(violation_registers))) as pool:
+            return list(pool.imap(_search_register, violation_registers, chunksize=1))
+    finally:
+        _WORKER_GRAPH = None
+        _WORKER_SEARCH_OPTIONS = {}
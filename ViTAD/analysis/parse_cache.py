@@ -0,0 +1,177 @@
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+import pyverilog
+
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+EVICT_INTERVAL = 64
+
+_INCLUDE_PATTERN = re.compile(rb'^\s*`include\s+"([^"]+)"', re.MULTILINE)
+_MISSING = object()
+
+
+class ParseCache:
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._tracked_bytes: Optional[int] = None
+        self._writes_since_evict = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _include_digests(self, content: bytes, base_dir: str, include: Sequence[str]) -> Iterator[bytes]:
+        pending = [(content, base_dir)]
+        seen = set()
+        while pending:
+            content, base_dir = pending.pop()
+            for match in _INCLUDE_PATTERN.finditer(content):
+                name = match.group(1).decode('utf-8', 'replace')
+                candidates = [os.path.join(directory, name) for directory in (base_dir, *include)]
+                resolved = next((path for path in candidates if os.path.isfile(path)), None)
+                key = os.path.abspath(resolved) if resolved is not None else name
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                if resolved is None:
+                    yield f"missing:{name}".encode('utf-8')
+                    continue
+
+                with open(resolved, 'rb') as f:
+                    included = f.read()
+                yield key.encode('utf-8') + b'\0' + hashlib.sha256(included).digest()
+                pending.append((included, os.path.dirname(resolved)))
+
+    def key_for(self, kind: str, content: bytes, base_dir: str = ".", include: Optional[Sequence[str]] = None,
+                define: Optional[Sequence[str]] = None) -> str:
+        include = tuple(include or ())
+        define = tuple(define or ())
+
+        digest = hashlib.sha256()
+        for part in (kind, str(CACHE_FORMAT_VERSION), pyverilog.__version__, *include, '\0', *define, '\0'):
+            digest.update(part.encode('utf-8') + b'\0')
+        digest.update(hashlib.sha256(content).digest())
+        for include_digest in self._include_digests(content, base_dir, include):
+            digest.update(include_digest)
+        return digest.hexdigest()
+
+    def key_for_file(self, kind: str, file_path: str, include: Optional[Sequence[str]] = None,
+                     define: Optional[Sequence[str]] = None) -> str:
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        return self.key_for(kind, content, os.path.dirname(os.path.abspath(file_path)), include, define)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return default
+        except Exception:
+            self._discard(entry_path)
+            return default
+        return value
+
+    def _discard(self, entry_path: str):
+        try:
+            os.remove(entry_path)
+        except FileNotFoundError:
+            pass
+
+    def put(self, key: str, value: Any) -> bool:
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (RecursionError, pickle.PicklingError, TypeError):
+            return False
+        if len(data) > self.max_bytes:
+            return False
+
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return False
+        entry_path = self._entry_path(key)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            try:
+                replaced_bytes = os.stat(entry_path).st_size
+            except FileNotFoundError:
+                replaced_bytes = 0
+            os.replace(temp_path, entry_path)
+        except OSError:
+            return False
+        finally:
+            self._discard(temp_path)
+
+        if self._tracked_bytes is None:
+            self._tracked_bytes = self.size()
+        else:
+            self._tracked_bytes += len(data) - replaced_bytes
+        self._writes_since_evict += 1
+        if self._tracked_bytes > self.max_bytes or self._writes_since_evict >= EVICT_INTERVAL:
+            self.evict()
+        return True
+
+    def get_or_create(self, key: str, create: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = create()
+            self.put(key, value)
+        return value
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".pkl"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        self._writes_since_evict = 0
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, entry_path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._discard(entry_path)
+                total -= size
+        self._tracked_bytes = total
+
+    def clear(self):
+        for _, _, entry_path in self._entries():
+            self._discard(entry_path)
+        self._tracked_bytes = 0
+        self._writes_since_evict = 0
+
+    def parse_file(self, file_path: str, parser: Callable[[str], Any], include: Optional[Sequence[str]] = None,
+                   define: Optional[Sequence[str]] = None) -> Any:
+        key = self.key_for_file("ast", file_path, include, define)
+        return self.get_or_create(key, lambda: parser(file_path))
+
+    def parse_text(self, text: str, parser: Callable[[str], Any], include: Optional[Sequence[str]] = None,
+                   define: Optional[Sequence[str]] = None) -> Any:
+        key = self.key_for("ast", text.encode('utf-8'), os.getcwd(), include, define)
+        return self.get_or_create(key, lambda: parser(text))
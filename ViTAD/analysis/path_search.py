@@ -0,0 +1,340 @@
+import heapq
+import time
+from itertools import count, islice
+from typing import Callable, Collection, Container, Dict, Hashable, Iterator, List, Mapping, Optional, Iterable, Sequence, Set, Tuple
+
+
+DEFAULT_MAX_EXPANSIONS = 200000
+
+
+def make_deadline(time_limit: Optional[float]) -> Optional[float]:
+    if time_limit is None:
+        return None
+    return time.monotonic() + time_limit
+
+
+def iter_simple_paths(successors: Mapping[Hashable, Iterable[Hashable]], source: Hashable, target: Hashable,
+                      max_depth: Optional[int] = None, deadline: Optional[float] = None,
+                      can_reach: Optional[Container[Hashable]] = None) -> Iterator[List[Hashable]]:
+    if source == target:
+        yield [source]
+        return
+    if can_reach is not None and source not in can_reach:
+        return
+    if max_depth is not None and max_depth < 1:
+        return
+
+    path = [source]
+    on_path = {source}
+    stack = [iter(successors[source])]
+    exhausted = object()
+
+    while stack:
+        if deadline is not None and time.monotonic() > deadline:
+            return
+
+        child = next(stack[-1], exhausted)
+        if child is exhausted:
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+
+        if child in on_path:
+            continue
+        if child == target:
+            yield path + [child]
+            continue
+        if can_reach is not None and child not in can_reach:
+            continue
+        if max_depth is not None and len(path) >= max_depth:
+            continue
+
+        path.append(child)
+        on_path.add(child)
+        stack.append(iter(successors[child]))
+
+
+def bounded_simple_paths(successors: Mapping[Hashable, Iterable[Hashable]], source: Hashable, target: Hashable,
+                         max_paths: Optional[int] = 10, max_depth: Optional[int] = None,
+                         deadline: Optional[float] = None,
+                         can_reach: Optional[Container[Hashable]] = None) -> List[List[Hashable]]:
+    paths = iter_simple_paths(successors, source, target, max_depth, deadline, can_reach)
+    if max_paths is None:
+        return list(paths)
+    return list(islice(paths, max_paths))
+
+
+def strongly_connected_components(successors: Mapping[Hashable, Iterable[Hashable]], nodes: Iterable[Hashable],
+                                  within: Optional[Container[Hashable]] = None) -> List[List[Hashable]]:
+    index_of: Dict[Hashable, int] = {}
+    lowlink: Dict[Hashable, int] = {}
+    on_stack: Set[Hashable] = set()
+    component_stack: List[Hashable] = []
+    components: List[List[Hashable]] = []
+
+    for root in nodes:
+        if root in index_of:
+            continue
+
+        index_of[root] = lowlink[root] = len(index_of)
+        component_stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors[root]))]
+
+        while work:
+            node, children = work[-1]
+            descended = False
+            for child in children:
+                if within is not None and child not in within:
+                    continue
+                if child not in index_of:
+                    index_of[child] = lowlink[child] = len(index_of)
+                    component_stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors[child])))
+                    descended = True
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[child])
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+            if lowlink[node] == index_of[node]:
+                component = []
+                while True:
+                    member = component_stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def remaining_weight_bounds(successors: Mapping[Hashable, Iterable[Hashable]], target: Hashable,
+                            members: Collection[Hashable],
+                            weight: Callable[[Hashable, Hashable], float]) -> Dict[Hashable, float]:
+    bounds: Dict[Hashable, float] = {}
+
+    for component in strongly_connected_components(successors, members, within=members):
+        component_set = set(component)
+        internal_out = []
+        best_exit = 0.0 if target in component_set else None
+
+        for node in component:
+            best_internal = 0.0
+            for succ in successors[node]:
+                if succ in component_set:
+                    best_internal = max(best_internal, weight(node, succ))
+                elif succ in bounds:
+                    candidate = weight(node, succ) + bounds[succ]
+                    if best_exit is None or candidate > best_exit:
+                        best_exit = candidate
+            internal_out.append(best_internal)
+
+        if best_exit is None:
+            continue
+        internal = sum(heapq.nlargest(len(component) - 1, internal_out))
+        for node in component:
+            bounds[node] = internal + best_exit
+
+    return bounds
+
+
+def heaviest_simple_paths(successors: Mapping[Hashable, Iterable[Hashable]], sources: Iterable[Hashable],
+                          target: Hashable, max_paths: Optional[int],
+                          weight: Callable[[Hashable, Hashable], float],
+                          can_reach: Collection[Hashable], max_depth: Optional[int] = None,
+                          deadline: Optional[float] = None,
+                          max_expansions: Optional[int] = DEFAULT_MAX_EXPANSIONS) -> List[Tuple[List[Hashable], float]]:
+    sources = list(sources)
+    bounds = remaining_weight_bounds(successors, target, can_reach, weight)
+    frontier = []
+    tie_breaker = count()
+
+    for source in sources:
+        if source == target:
+            heapq.heappush(frontier, (-0.0, next(tie_breaker), (source,), 0.0, True))
+            continue
+        if max_depth is not None and max_depth < 1:
+            continue
+
+        bound = bounds.get(source)
+        if bound is None:
+            bound = max((weight(source, succ) + bounds[succ] for succ in successors[source] if succ in bounds),
+                        default=None)
+        if bound is not None:
+            heapq.heappush(frontier, (-bound, next(tie_breaker), (source,), 0.0, False))
+
+    ranked = []
+    expansions = 0
+    while frontier and (max_paths is None or len(ranked) < max_paths):
+        if deadline is not None and time.monotonic() > deadline:
+            break
+
+        _, _, path, path_weight, complete = heapq.heappop(frontier)
+        if complete:
+            ranked.append((list(path), path_weight))
+            continue
+
+        expansions += 1
+        if max_expansions is not None and expansions > max_expansions:
+            ranked.extend(_unranked_simple_paths(successors, sources, target, max_paths, weight, can_reach,
+                                                 max_depth, deadline, ranked))
+            ranked.sort(key=lambda item: item[1], reverse=True)
+            break
+
+        tail = path[-1]
+        can_extend = max_depth is None or len(path) < max_depth
+        for child in successors[tail]:
+            if child in path:
+                continue
+
+            child_weight = path_weight + weight(tail, child)
+            if child == target:
+                heapq.heappush(frontier, (-child_weight, next(tie_breaker), path + (child,), child_weight, True))
+                continue
+            if not can_extend:
+                continue
+
+            bound = bounds.get(child)
+            if bound is not None:
+                heapq.heappush(frontier, (-(child_weight + bound), next(tie_breaker), path + (child,),
+                                          child_weight, False))
+
+    return ranked
+
+
+def _unranked_simple_paths(successors: Mapping[Hashable, Iterable[Hashable]], sources: Sequence[Hashable],
+                           target: Hashable, max_paths: Optional[int],
+                           weight: Callable[[Hashable, Hashable], float],
+                           can_reach: Collection[Hashable], max_depth: Optional[int],
+                           deadline: Optional[float],
+                           ranked: Sequence[Tuple[List[Hashable], float]]) -> Iterator[Tuple[List[Hashable], float]]:
+    seen = {tuple(path) for path, _ in ranked}
+    remaining = None if max_paths is None else max_paths - len(ranked)
+
+    for source in sources:
+        if source in can_reach or source == target:
+            paths = iter_simple_paths(successors, source, target, max_depth, deadline, can_reach)
+        elif max_depth is not None and max_depth < 1:
+            continue
+        else:
+            child_depth = None if max_depth is None else max_depth - 1
+            paths = ([source] + path for child in successors[source] if child in can_reach
+                     for path in iter_simple_paths(successors, child, target, child_depth, deadline, can_reach))
+
+        for path in paths:
+            if remaining is not None and remaining <= 0:
+                return
+            if tuple(path) in seen:
+                continue
+            seen.add(tuple(path))
+            remaining = None if remaining is None else remaining - 1
+            yield path, sum(weight(a, b) for a, b in zip(path, path[1:]))
+
+
+class PathPositionIndex:
+
+    def __init__(self):
+        self._postings: Dict[Hashable, Dict[int, int]] = {}
+
+    def add_path(self, path_id: int, path: Sequence[Hashable]):
+        for position, node in enumerate(path):
+            self._postings.setdefault(node, {}).setdefault(path_id, position)
+
+    def paths_with_order(self, first: Hashable, second: Hashable) -> List[int]:
+        first_postings = self._postings.get(first)
+        second_postings = self._postings.get(second)
+        if not first_postings or not second_postings:
+            return []
+
+        if len(first_postings) <= len(second_postings):
+            return [path_id for path_id, position in first_postings.items()
+                    if second_postings.get(path_id, -1) > position]
+
+        return [path_id for path_id, position in second_postings.items()
+                if path_id in first_postings and first_postings[path_id] < position]
+
+
+class PathTrie:
+
+    def __init__(self):
+        self._symbols: Dict[Hashable, int] = {}
+        self._children: Dict[int, int] = {}
+        self._terminals: Set[int] = set()
+        self._node_count = 1
+
+    def __len__(self) -> int:
+        return len(self._terminals)
+
+    def _intern(self, node: Hashable) -> int:
+        symbol = self._symbols.get(node)
+        if symbol is None:
+            symbol = len(self._symbols)
+            self._symbols[node] = symbol
+        return symbol
+
+    def add(self, path: Iterable[Hashable]) -> bool:
+        children = self._children
+        trie_node = 0
+        for node in path:
+            edge = (self._intern(node) << 32) | trie_node
+            child = children.get(edge)
+            if child is None:
+                child = self._node_count
+                self._node_count += 1
+                children[edge] = child
+            trie_node = child
+
+        if trie_node in self._terminals:
+            return False
+        self._terminals.add(trie_node)
+        return True
+
+    def __contains__(self, path: Iterable[Hashable]) -> bool:
+        trie_node = 0
+        for node in path:
+            symbol = self._symbols.get(node)
+            if symbol is None:
+                return False
+            trie_node = self._children.get((symbol << 32) | trie_node)
+            if trie_node is None:
+                return False
+        return trie_node in self._terminals
+
+
+def ancestors_of(predecessors: Mapping[Hashable, Iterable[Hashable]], target: Hashable) -> Set[Hashable]:
+    reaching = {target}
+    stack = [target]
+    while stack:
+        node = stack.pop()
+        for pred in predecessors[node]:
+            if pred not in reaching:
+                reaching.add(pred)
+                stack.append(pred)
+    return reaching
+
+
+def ancestors_within(predecessors: Mapping[Hashable, Iterable[Hashable]], target: Hashable,
+                     allowed: Callable[[Hashable], bool]) -> Tuple[Set[Hashable], Set[Hashable]]:
+    reaching = {target}
+    boundary = set()
+    stack = [target]
+    while stack:
+        node = stack.pop()
+        for pred in predecessors[node]:
+            if pred in reaching or pred in boundary:
+                continue
+            if allowed(pred):
+                reaching.add(pred)
+                stack.append(pred)
+            else:
+                boundary.add(pred)
+    return reaching, boundary
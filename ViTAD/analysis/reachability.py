@@ -0,0 +1,51 @@
+from typing import Dict, Hashable, Iterable, List
+from condensation import Condensation
+
+
+class EntryReachabilityIndex:
+
+    def __init__(self, condensation: Condensation, entries: Iterable[Hashable]):
+        self.entries: List[Hashable] = list(dict.fromkeys(entries))
+        self._entry_bit: Dict[Hashable, int] = {entry: 1 << i for i, entry in enumerate(self.entries)}
+        self._scc_of: Dict[Hashable, int] = {}
+        self._scc_bits: List[int] = []
+
+        self._build(condensation)
+
+    def _build(self, condensation: Condensation):
+        self._scc_of = condensation.component_of
+
+
+        scc_bits = [0] * len(condensation)
+        shared_bits: Dict[int, int] = {}
+
+        for scc in range(len(condensation)):
+            bits = 0
+            for member in condensation.members[scc]:
+                bits |= self._entry_bit.get(member, 0)
+            for pred in condensation.pred[scc]:
+                bits |= scc_bits[pred]
+
+            scc_bits[scc] = shared_bits.setdefault(bits, bits)
+
+        self._scc_bits = scc_bits
+
+    def reaches(self, entry: Hashable, node: Hashable) -> bool:
+        scc = self._scc_of.get(node)
+        bit = self._entry_bit.get(entry)
+        if scc is None or bit is None:
+            return False
+        return bool(self._scc_bits[scc] & bit)
+
+    def entries_reaching(self, node: Hashable) -> List[Hashable]:
+        scc = self._scc_of.get(node)
+        if scc is None:
+            return []
+
+        bits = self._scc_bits[scc]
+        reaching = []
+        while bits:
+            lowest = bits & -bits
+            reaching.append(self.entries[lowest.bit_length() - 1])
+            bits ^= lowest
+        return reaching
@@ -0,0 +1,70 @@
+import mmap
+import os
+from array import array
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Iterator, Optional, Union
+
+
+class SourceFileIndex(Mapping):
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], encoding: str = 'utf-8', cache_size: int = 4096):
+        self._buffer = buffer
+        self.encoding = encoding
+
+        offsets = array('Q', [0])
+        position = buffer.find(b'\n')
+        while position != -1:
+            offsets.append(position + 1)
+            position = buffer.find(b'\n', position + 1)
+        self._offsets = offsets
+
+        self.get_line = lru_cache(maxsize=cache_size)(self._read_line)
+
+    @classmethod
+    def from_text(cls, content: str, encoding: str = 'utf-8', cache_size: int = 4096) -> 'SourceFileIndex':
+        return cls(content.encode(encoding), encoding, cache_size)
+
+    @classmethod
+    def from_file(cls, file_path: str, encoding: str = 'utf-8', cache_size: int = 4096) -> 'SourceFileIndex':
+        if os.path.getsize(file_path) == 0:
+            return cls(b'', encoding, cache_size)
+
+        with open(file_path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, encoding, cache_size)
+
+    @property
+    def line_count(self) -> int:
+        return len(self._offsets)
+
+    @property
+    def text(self) -> str:
+        return str(self._buffer[:], self.encoding, 'replace')
+
+    def get_raw_line(self, line_number: int) -> Optional[str]:
+        if line_number < 1 or line_number > len(self._offsets):
+            return None
+
+        start = self._offsets[line_number - 1]
+        if line_number < len(self._offsets):
+            end = self._offsets[line_number] - 1
+        else:
+            end = len(self._buffer)
+        return str(self._buffer[start:end], self.encoding, 'replace')
+
+    def _read_line(self, line_number: int) -> Optional[str]:
+        line = self.get_raw_line(line_number)
+        return None if line is None else line.strip()
+
+    def __getitem__(self, line_number: int) -> str:
+        line = self.get_line(line_number)
+        if line is None:
+            raise KeyError(line_number)
+        return line
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(1, len(self._offsets) + 1))
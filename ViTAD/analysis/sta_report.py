@@ -0,0 +1,120 @@
+import re
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from stdg import ViolationInfo, ViolationType
+
+
+PATH_TYPES = {
+    'max': ViolationType.SETUP,
+    'min': ViolationType.HOLD
+}
+
+_HEADER_PATTERN = re.compile(r'^\s*(Startpoint|Endpoint|Path Group|Path Type):\s*(\S+)(.*)$')
+_CLOCK_PATTERN = re.compile(r'clocked\s+by\s+([^\s\)]+)')
+_CLOCK_FIELDS = {
+    'Startpoint': 'source_clock',
+    'Endpoint': 'target_clock'
+}
+_NUMBER = r'(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)'
+_VALUE_PATTERNS = {
+    'arrival_time': re.compile(r'data arrival time'),
+    'required_time': re.compile(r'data required time'),
+    'slack': re.compile(r'^\s*(?:' + _NUMBER + r'\s+)?slack\b')
+}
+_LEADING_NUMBER = re.compile(r'^\s*' + _NUMBER + r'\s')
+_TRAILING_NUMBER = re.compile(_NUMBER + r'\s*$')
+
+
+def _line_value(line: str) -> Optional[float]:
+    match = _LEADING_NUMBER.match(line) or _TRAILING_NUMBER.search(line)
+    return float(match.group(1)) if match else None
+
+
+def _build_violation(fields: Dict, resolve: Callable[[str], str]) -> Optional[Tuple[str, str, ViolationInfo]]:
+    if 'Startpoint' not in fields or 'Endpoint' not in fields:
+        return None
+
+    violation_type = PATH_TYPES.get(fields.get('Path Type'))
+    if violation_type is None:
+        return None
+
+    startpoint = resolve(fields['Startpoint'])
+    endpoint = resolve(fields['Endpoint'])
+    source_clock = fields.get('source_clock')
+    target_clock = fields.get('target_clock')
+    violation_info = ViolationInfo(
+        violation_type=violation_type,
+        slack=fields.get('slack'),
+        startpoint=startpoint,
+        endpoint=endpoint,
+        path_group=fields.get('Path Group'),
+        required_time=fields.get('required_time'),
+        arrival_time=fields.get('arrival_time'),
+        source_clock_domain=source_clock,
+        target_clock_domain=target_clock,
+        is_cross_clock_domain=(source_clock is not None and target_clock is not None
+                               and source_clock != target_clock)
+    )
+    return startpoint, endpoint, violation_info
+
+
+def iter_sta_report(lines: Iterable[str], resolve: Optional[Callable[[str], str]] = None,
+                    violated_only: bool = True) -> Iterator[Tuple[str, str, ViolationInfo]]:
+    if resolve is None:
+        resolve = str
+
+    fields: Dict = {}
+    pending_clock: Optional[Tuple[str, str]] = None
+    for line in lines:
+        header = _HEADER_PATTERN.match(line)
+        if header is not None:
+            name, value, rest = header.groups()
+            if name == 'Startpoint':
+                fields = {}
+            fields[name] = value
+
+            pending_clock = None
+            clock_field = _CLOCK_FIELDS.get(name)
+            if clock_field is not None:
+                clock = _CLOCK_PATTERN.search(rest)
+                if clock is not None:
+                    fields[clock_field] = clock.group(1)
+                else:
+                    pending_clock = (clock_field, rest)
+            continue
+
+        if pending_clock is not None:
+            clock_field, text = pending_clock
+            text = text + ' ' + line.strip()
+            clock = _CLOCK_PATTERN.search(text)
+            if clock is not None:
+                fields[clock_field] = clock.group(1)
+                pending_clock = None
+            elif ')' in line or not line.strip():
+                pending_clock = None
+            else:
+                pending_clock = (clock_field, text)
+
+        if 'Startpoint' not in fields:
+            continue
+
+        for key, pattern in _VALUE_PATTERNS.items():
+            if key not in fields and pattern.search(line):
+                fields[key] = _line_value(line)
+                break
+        else:
+            continue
+
+        if 'slack' in fields:
+            violated = 'VIOLATED' in line or (fields['slack'] is not None and fields['slack'] < 0)
+            if violated or not violated_only:
+                violation = _build_violation(fields, resolve)
+                if violation is not None:
+                    yield violation
+            fields = {}
+
+
+def load_sta_report(file_path: str, resolve: Optional[Callable[[str], str]] = None,
+                    violated_only: bool = True) -> Iterator[Tuple[str, str, ViolationInfo]]:
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        yield from iter_sta_report(f, resolve, violated_only)
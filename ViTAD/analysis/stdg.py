@@ -1,7 +1,24 @@
 from enum import Enum
-from dataclasses import dataclass
-from typing import Dict, List, Set, Optional, Tuple, Any
+from dataclasses import dataclass, fields, replace
+from itertools import chain
+from typing import Callable, Dict, List, Set, Optional, Tuple, Any, Iterable, Iterator, Mapping, MutableMapping, Sequence
 import networkx as nx
+from attribute_index import AttributeIndex, matches
+from compact_graph import CompactGraph
+from condensation import Condensation
+from hierarchy import (
+    HierarchicalView, ModuleInstance, ModuleTemplate, format_hierarchical_node, parse_hierarchical_node,
+    top_modules
+)
+from cones import FANIN, FANOUT, LogicCone, extract_cone
+from path_search import (
+    PathPositionIndex, PathTrie, ancestors_of, ancestors_within, bounded_simple_paths, heaviest_simple_paths,
+    iter_simple_paths, make_deadline
+)
+from parallel_search import fork_available, resolve_worker_count, search_registers_in_pool
+from reachability import EntryReachabilityIndex
+from source_index import SourceFileIndex
+from timing_arcs import TimingArcGraph
 
 
 class NodeType(Enum):
@@ -36,7 +53,7 @@ class LogicType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class SourceCodeInfo:
     file_path: str = ""
     line_number: int = 0
@@ -50,7 +67,7 @@ class SourceCodeInfo:
         return f"{self.file_path}:{self.line_number}"
 
 
-@dataclass
+@dataclass(slots=True)
 class ViolationInfo:
     violation_type: ViolationType = ViolationType.NONE
     slack: Optional[float] = None
@@ -66,7 +83,52 @@ class ViolationInfo:
     cdc_risk_level: Optional[str] = None
 
 
-@dataclass
+class _SharedSourceCodeInfo(SourceCodeInfo):
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError("EMPTY_SOURCE_INFO是共享只读对象, 请使用own_source_info()获取可写副本")
+
+    def __reduce__(self):
+        return "EMPTY_SOURCE_INFO"
+
+
+class _SharedViolationInfo(ViolationInfo):
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError("EMPTY_VIOLATION_INFO是共享只读对象, 请使用own_violation_info()获取可写副本")
+
+    def __reduce__(self):
+        return "EMPTY_VIOLATION_INFO"
+
+
+class _SharedProperties(dict):
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("EMPTY_PROPERTIES是共享只读对象, 请使用set_property()写入属性")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return "EMPTY_PROPERTIES"
+
+
+def _shared_default(shared_cls, base_cls):
+    instance = object.__new__(shared_cls)
+    for f in fields(base_cls):
+        object.__setattr__(instance, f.name, f.default)
+    return instance
+
+
+EMPTY_SOURCE_INFO: SourceCodeInfo = _shared_default(_SharedSourceCodeInfo, SourceCodeInfo)
+EMPTY_VIOLATION_INFO: ViolationInfo = _shared_default(_SharedViolationInfo, ViolationInfo)
+EMPTY_PROPERTIES: Mapping = _SharedProperties()
+EMPTY_SOURCES: Tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
 class CodeStructureNode:
     node_id: str
     node_type: NodeType
@@ -91,29 +153,49 @@ class CodeStructureNode:
 
     logic_type: LogicType = LogicType.UNKNOWN
     assignment_target: Optional[str] = None
-    assignment_sources: List[str] = None
+    assignment_sources: Sequence[str] = None
     condition_expression: Optional[str] = None
 
 
     violation_info: ViolationInfo = None
 
 
-    properties: Dict = None
+    properties: Mapping = None
 
     def __post_init__(self):
         if self.violation_info is None:
-            self.violation_info = ViolationInfo()
+            self.violation_info = EMPTY_VIOLATION_INFO
         if self.properties is None:
-            self.properties = {}
+            self.properties = EMPTY_PROPERTIES
         if self.assignment_sources is None:
-            self.assignment_sources = []
+            self.assignment_sources = EMPTY_SOURCES
         if self.source_info is None:
-            self.source_info = SourceCodeInfo()
+            self.source_info = EMPTY_SOURCE_INFO
 
 
         if self.signal_width is not None and self.signal_width > 1:
             self.is_multi_bit = True
 
+    def own_source_info(self) -> SourceCodeInfo:
+        if self.source_info is EMPTY_SOURCE_INFO:
+            self.source_info = SourceCodeInfo()
+        return self.source_info
+
+    def own_violation_info(self) -> ViolationInfo:
+        if self.violation_info is EMPTY_VIOLATION_INFO:
+            self.violation_info = ViolationInfo()
+        return self.violation_info
+
+    def set_property(self, key: str, value: Any):
+        if self.properties is EMPTY_PROPERTIES:
+            self.properties = {}
+        self.properties[key] = value
+
+    def add_assignment_source(self, source: str):
+        if self.assignment_sources is EMPTY_SOURCES:
+            self.assignment_sources = []
+        self.assignment_sources.append(source)
+
     def get_display_statement(self) -> str:
         if self.source_info.formatted_statement:
             return self.source_info.formatted_statement
@@ -139,7 +221,7 @@ class CodeStructureNode:
         return self.name
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeStructureEdge:
     source: str
     target: str
@@ -160,13 +242,13 @@ class CodeStructureEdge:
     is_multi_bit_cdc: bool = False
 
 
-    properties: Dict = None
+    properties: Mapping = None
 
     def __post_init__(self):
         if self.properties is None:
-            self.properties = {}
+            self.properties = EMPTY_PROPERTIES
         if self.source_info is None:
-            self.source_info = SourceCodeInfo()
+            self.source_info = EMPTY_SOURCE_INFO
 
 
         if (self.crosses_clock_domain and
@@ -174,122 +256,635 @@ class CodeStructureEdge:
                 self.signal_width > 1):
             self.is_multi_bit_cdc = True
 
+    def own_source_info(self) -> SourceCodeInfo:
+        if self.source_info is EMPTY_SOURCE_INFO:
+            self.source_info = SourceCodeInfo()
+        return self.source_info
+
+    def set_property(self, key: str, value: Any):
+        if self.properties is EMPTY_PROPERTIES:
+            self.properties = {}
+        self.properties[key] = value
+
+
+def field_values(obj) -> Dict[str, Any]:
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
+
+class _SearchSpace:
+
+    def __init__(self, members: Set[str], start: str):
+        self._members = members
+        self._start = start
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id == self._start or node_id in self._members
+
+
+NODE_TYPE_CODES = {node_type: code for code, node_type in enumerate(NodeType)}
+
+NODE_INDEX_KEYS = {
+    'node_type': lambda node: node.node_type,
+    'logic_type': lambda node: node.logic_type,
+    'clock_domain': lambda node: node.clock_domain,
+    'module_name': lambda node: node.module_name,
+    'direction': lambda node: node.properties.get('direction')
+}
+
+EDGE_INDEX_KEYS = {
+    'edge_type': lambda edge: edge.edge_type
+}
+
+OPTIONAL_PATH_KEYS = ('path_weight', 'cyclic_regions', 'register_path', 'logic_depth')
+
 
 class CodeStructureGraph:
 
-    def __init__(self):
-        self.graph = nx.DiGraph()
+    def __init__(self, compact: bool = False):
+        self._compact: Optional[CompactGraph] = CompactGraph() if compact else None
+        self._nx_graph: Optional[nx.DiGraph] = None if compact else nx.DiGraph()
         self.nodes: Dict[str, CodeStructureNode] = {}
         self.edges: Dict[Tuple[str, str], CodeStructureEdge] = {}
         self.violation_registers: Set[str] = set()
         self.violation_paths: List[Dict] = []
+        self.module_templates: Dict[str, ModuleTemplate] = {}
+        self.module_instances: Dict[str, ModuleInstance] = {}
+
+        self._entry_candidates: Optional[Tuple[List[str], List[str], List[str]]] = None
+        self._edges_awaiting_nodes: Dict[str, List[Tuple[str, str]]] = {}
+        self._cdc_edges: Optional[Dict[Tuple[str, str], Tuple[str, int, Tuple[str, str]]]] = {}
+        self._cdc_counters: Dict[str, int] = {'total_cdc_edges': 0, 'single_bit_cdc': 0, 'multi_bit_cdc': 0}
+        self._cdc_domain_pairs: Dict[Tuple[str, str], int] = {}
+        self._node_index: Optional[AttributeIndex] = AttributeIndex(NODE_INDEX_KEYS)
+        self._edge_index: Optional[AttributeIndex] = AttributeIndex(EDGE_INDEX_KEYS)
+        self._domain_edges: Dict[Optional[str], List[Tuple[str, str]]] = {}
+        self._reachability: Optional[EntryReachabilityIndex] = None
+        self._condensation: Optional[Condensation] = None
+        self._timing_arcs: Optional[TimingArcGraph] = None
+        self._display_cache: Dict[str, str] = {}
+        self._cone_cache: Dict[Tuple[str, Optional[int], str, bool], LogicCone] = {}
+        self._hierarchy_views: Dict[str, HierarchicalView] = {}
+        self._source_provenance: Optional[Dict[str, Dict[Any, int]]] = {}
+        self._violation_marks: Dict[str, ViolationInfo] = {}
+        self._violation_path_keys: Dict[Tuple[str, str, ViolationType], int] = {}
+        self._violation_slack_order: Optional[List[int]] = None
+        self._violation_launches: Optional[Dict[str, List[Tuple[str, Optional[str]]]]] = None
+
+        self.source_files: Dict[str, SourceFileIndex] = {}
+
+    @property
+    def graph(self) -> nx.DiGraph:
+        if self._nx_graph is None:
+            self._nx_graph = self._compact.to_networkx()
+        return self._nx_graph
+
+    @property
+    def compact(self) -> Optional[CompactGraph]:
+        return self._compact
+
+    def _successors(self):
+        if self._compact is not None:
+            return self._compact.succ
+        return self._nx_graph.succ
+
+    def _predecessors(self):
+        if self._compact is not None:
+            return self._compact.pred
+        return self._nx_graph.pred
+
+    def _in_degree(self, node_id: str) -> int:
+        if self._compact is not None:
+            return self._compact.in_degree(node_id)
+        return self._nx_graph.in_degree(node_id)
+
+    def _out_degree(self, node_id: str) -> int:
+        if self._compact is not None:
+            return self._compact.out_degree(node_id)
+        return self._nx_graph.out_degree(node_id)
+
+    def has_graph_node(self, node_id: str) -> bool:
+        if self._compact is not None:
+            return node_id in self._compact
+        return node_id in self._nx_graph
+
+    def iter_graph_node_ids(self) -> Iterator[str]:
+        if self._compact is not None:
+            return self._compact.iter_node_ids()
+        return iter(self._nx_graph)
+
+    def save(self, file_path: str):
+        from stdg_store import save_graph
+        save_graph(self, file_path)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'CodeStructureGraph':
+        from stdg_store import load_graph
+        return load_graph(file_path)
+
+    def _attach_storage(self, nodes: MutableMapping, edges: MutableMapping, compact: CompactGraph,
+                        violation_registers: Set[str], violation_paths: List[Dict]):
+        self._compact = compact
+        self._nx_graph = None
+        self.nodes = nodes
+        self.edges = edges
+        self.violation_registers = violation_registers
+        self.violation_paths = violation_paths
+
+
+        self._node_index = None
+        self._edge_index = None
+        self._cdc_edges = None
+        self._source_provenance = None
+        self._invalidate_caches()
+
+        self._violation_path_keys = {}
+        self._violation_slack_order = None
+        self._violation_launches = None
+        for position, violation_path in enumerate(violation_paths):
+            violation_info = violation_path['violation_info']
+            self._violation_marks[violation_path['startpoint']] = violation_info
+            self._violation_marks[violation_path['endpoint']] = violation_info
+            path_key = (violation_path['startpoint'], violation_path['endpoint'], violation_info.violation_type)
+            self._violation_path_keys[path_key] = position
+
+    @property
+    def line_to_statement(self) -> Mapping[str, SourceFileIndex]:
+        return self.source_files
+
+    def add_source_file(self, file_path: str, content: Optional[str] = None):
+        if content is None:
+            self.source_files[file_path] = SourceFileIndex.from_file(file_path)
+        else:
+            self.source_files[file_path] = SourceFileIndex.from_text(content)
 
-
-        self.source_files: Dict[str, str] = {}
-        self.line_to_statement: Dict[str, Dict[int, str]] = {}
-
-    def add_source_file(self, file_path: str, content: str):
-        self.source_files[file_path] = content
-
-
-        lines = content.split('\n')
-        self.line_to_statement[file_path] = {}
-        for i, line in enumerate(lines, 1):
-            self.line_to_statement[file_path][i] = line.strip()
+    def get_source_line(self, file_path: str, line_number: int) -> Optional[str]:
+        source = self.source_files.get(file_path)
+        if source is None:
+            return None
+        return source.get_line(line_number)
 
     def add_node(self, node: CodeStructureNode):
+        previous = self.nodes.get(node.node_id)
+        if previous is not None:
+            self._unindex_node_partitions(previous)
+            self._unindex_provenance(node.node_id, previous.source_info)
+        if node.violation_info is EMPTY_VIOLATION_INFO and node.node_id in self._violation_marks:
+            node.violation_info = self._violation_marks[node.node_id]
+
         self.nodes[node.node_id] = node
-        self.graph.add_node(node.node_id, **node.__dict__)
+        self._display_cache.pop(node.node_id, None)
+        self._index_node_partitions(node)
+        self._index_provenance(node.node_id, node.source_info)
+        if self._compact is not None:
+            self._compact.add_node(node.node_id, NODE_TYPE_CODES[node.node_type],
+                                   node.clock_domain, node.signal_width)
+        else:
+            self._nx_graph.add_node(node.node_id, **field_values(node))
+        self._invalidate_caches()
 
 
         if node.violation_info.violation_type != ViolationType.NONE:
             self.violation_registers.add(node.node_id)
 
+
+        for edge_key in self._edges_awaiting_nodes.pop(node.node_id, ()):
+            if edge_key in self.edges:
+                self._retag_cdc_edge(edge_key)
+
+        if previous is not None and previous.clock_domain != node.clock_domain:
+            self._retag_incident_edges(node.node_id)
+
+    def update_node(self, node_id: str, **changes) -> CodeStructureNode:
+        node = replace(self.nodes[node_id], **changes)
+        self.add_node(node)
+        return node
+
     def add_edge(self, edge: CodeStructureEdge):
         edge_key = (edge.source, edge.target)
+        previous = self.edges.get(edge_key)
+        if previous is not None:
+            self._unindex_provenance(edge_key, previous.source_info)
+            if self._edge_index is not None:
+                self._edge_index.discard(edge_key, previous)
+        self._index_provenance(edge_key, edge.source_info)
+        if self._edge_index is not None:
+            self._edge_index.add(edge_key, edge)
+
+
+        if self._compact is not None:
+            if edge_key not in self.edges:
+                self._compact.add_edge(edge.source, edge.target)
+        else:
+            self._nx_graph.add_edge(edge.source, edge.target, **field_values(edge))
+        self.edges[edge_key] = edge
+        self._invalidate_caches()
 
 
-        if edge.source in self.nodes and edge.target in self.nodes:
-            source_clock = self.nodes[edge.source].clock_domain
-            target_clock = self.nodes[edge.target].clock_domain
+        for endpoint in (edge.source, edge.target):
+            if endpoint not in self.nodes:
+                self._edges_awaiting_nodes.setdefault(endpoint, []).append(edge_key)
 
-            if source_clock and target_clock and source_clock != target_clock:
-                edge.crosses_clock_domain = True
-                edge.source_clock_domain = source_clock
-                edge.target_clock_domain = target_clock
+        self._retag_cdc_edge(edge_key)
+
+    def remove_edge(self, source: str, target: str) -> Optional[CodeStructureEdge]:
+        edge_key = (source, target)
+        edge = self.edges.pop(edge_key, None)
+        if edge is None:
+            return None
 
+        if self._compact is not None:
+            self._compact.remove_edge(source, target)
+        else:
+            self._nx_graph.remove_edge(source, target)
+
+        self._untrack_cdc_edge(edge_key)
+        self._unindex_provenance(edge_key, edge.source_info)
+        if self._edge_index is not None:
+            self._edge_index.discard(edge_key, edge)
+        self._invalidate_caches()
+        return edge
+
+    def remove_node(self, node_id: str) -> Optional[CodeStructureNode]:
+        if not self.has_graph_node(node_id):
+            return None
+
+        for succ in list(self._successors()[node_id]):
+            self.remove_edge(node_id, succ)
+        for pred in list(self._predecessors()[node_id]):
+            self.remove_edge(pred, node_id)
+
+        node = self._detach_node(node_id)
+        if self._compact is not None:
+            self._compact.remove_node(node_id)
+        else:
+            self._nx_graph.remove_node(node_id)
+        self._edges_awaiting_nodes.pop(node_id, None)
+        self._invalidate_caches()
+        return node
+
+    def _detach_node(self, node_id: str) -> Optional[CodeStructureNode]:
+        node = self.nodes.pop(node_id, None)
+        if node is None:
+            return None
+
+        self._unindex_node_partitions(node)
+        self._unindex_provenance(node_id, node.source_info)
+        self._display_cache.pop(node_id, None)
+        self.violation_registers.discard(node_id)
+        if self.module_instances.pop(node_id, None) is not None:
+            self._hierarchy_views.clear()
+        template = self.module_templates.get(node.module_name)
+        if template is not None and template.node_id == node_id:
+            del self.module_templates[node.module_name]
+            self._hierarchy_views.clear()
+
+        if self._compact is not None:
+            self._compact.add_node(node_id, CompactGraph.NO_VALUE)
+        else:
+            self._nx_graph.nodes[node_id].clear()
 
-                if edge.signal_width is None:
 
-                    source_node = self.nodes[edge.source]
-                    if source_node.signal_width is not None:
-                        edge.signal_width = source_node.signal_width
+        incident = ([(node_id, succ) for succ in self._successors()[node_id]] +
+                    [(pred, node_id) for pred in self._predecessors()[node_id]])
+        for edge_key in incident:
+            edge = self.edges.get(edge_key)
+            if edge is None:
+                continue
 
-        self.edges[edge_key] = edge
-        self.graph.add_edge(edge.source, edge.target, **edge.__dict__)
+            edge.crosses_clock_domain = False
+            edge.source_clock_domain = None
+            edge.target_clock_domain = None
+            edge.is_multi_bit_cdc = False
+            if self._compact is None:
+                self._nx_graph.edges[edge_key].update(crosses_clock_domain=False, source_clock_domain=None,
+                                                      target_clock_domain=None, is_multi_bit_cdc=False)
+            self._untrack_cdc_edge(edge_key)
+            self._edges_awaiting_nodes.setdefault(node_id, []).append(edge_key)
+
+        self._invalidate_caches()
+        return node
+
+    def _get_source_provenance(self) -> Dict[str, Dict[Any, int]]:
+        if self._source_provenance is None:
+            self._source_provenance = {}
+            for node_id, node in self.nodes.items():
+                self._index_provenance(node_id, node.source_info)
+            for edge_key, edge in self.edges.items():
+                self._index_provenance(edge_key, edge.source_info)
+        return self._source_provenance
+
+    def _index_provenance(self, key: Any, source_info: SourceCodeInfo):
+        if self._source_provenance is None or not source_info.file_path:
+            return
+        self._source_provenance.setdefault(source_info.file_path, {})[key] = source_info.line_number
+
+    def _unindex_provenance(self, key: Any, source_info: SourceCodeInfo):
+        if self._source_provenance is None or not source_info.file_path:
+            return
+
+        entries = self._source_provenance.get(source_info.file_path)
+        if entries is not None:
+            entries.pop(key, None)
+            if not entries:
+                del self._source_provenance[source_info.file_path]
+
+    def remove_source_range(self, file_path: str, start_line: Optional[int] = None,
+                            end_line: Optional[int] = None) -> Tuple[List[str], List[Tuple[str, str]]]:
+        entries = self._get_source_provenance().get(file_path, {})
+        affected = [key for key, line_number in entries.items()
+                    if (start_line is None or line_number >= start_line) and
+                    (end_line is None or line_number <= end_line)]
+
+        removed_edges = [key for key in affected if isinstance(key, tuple)]
+        removed_nodes = [key for key in affected if not isinstance(key, tuple)]
+
+        for edge_key in removed_edges:
+            self.remove_edge(*edge_key)
+
+        for node_id in removed_nodes:
+            if self._in_degree(node_id) or self._out_degree(node_id):
+                self._detach_node(node_id)
+            else:
+                self.remove_node(node_id)
 
-    def get_execution_trace_display(self, execution_path: List[str]) -> List[str]:
-        display_path = []
+        return removed_nodes, removed_edges
 
-        for node_id in execution_path:
-            if node_id in self.nodes:
-                node = self.nodes[node_id]
+    def set_node_clock_domain(self, node_id: str, clock_domain: Optional[str]):
+        node = self.nodes[node_id]
+        if node.clock_domain == clock_domain:
+            return
 
-                if node.node_type == NodeType.LOGIC_BLOCK:
+        self._unindex_node_partitions(node)
+        node.clock_domain = clock_domain
+        self._index_node_partitions(node)
+        if self._compact is not None:
+            self._compact.set_clock_domain(node_id, clock_domain)
+        else:
+            self._nx_graph.nodes[node_id]['clock_domain'] = clock_domain
+
+        self._display_cache.pop(node_id, None)
+        self._invalidate_caches()
+        self._retag_incident_edges(node_id)
+
+    def set_node_property(self, node_id: str, key: str, value: Any):
+        node = self.nodes[node_id]
+        self._unindex_node_partitions(node)
+        node.set_property(key, value)
+        self._index_node_partitions(node)
+        if self._compact is None:
+            self._nx_graph.nodes[node_id]['properties'] = node.properties
+
+        self._display_cache.pop(node_id, None)
+        self._invalidate_caches()
+
+    def set_edge_property(self, source: str, target: str, key: str, value: Any):
+        edge_key = (source, target)
+        edge = self.edges[edge_key]
+        if self._edge_index is not None:
+            self._edge_index.discard(edge_key, edge)
+        edge.set_property(key, value)
+        if self._edge_index is not None:
+            self._edge_index.add(edge_key, edge)
+        if self._compact is None:
+            self._nx_graph.edges[edge_key]['properties'] = edge.properties
+
+        self._invalidate_caches()
+
+    def _retag_incident_edges(self, node_id: str):
+        if not self.has_graph_node(node_id):
+            return
+
+        for succ in self._successors()[node_id]:
+            self._retag_cdc_edge((node_id, succ))
+        for pred in self._predecessors()[node_id]:
+            self._retag_cdc_edge((pred, node_id))
+
+    def _retag_cdc_edge(self, edge_key: Tuple[str, str]):
+        edge = self.edges.get(edge_key)
+        if edge is None:
+            return
+
+        source_node = self.nodes.get(edge.source)
+        target_node = self.nodes.get(edge.target)
+
+        if source_node is not None and target_node is not None:
+            if (source_node.clock_domain and target_node.clock_domain and
+                    source_node.clock_domain != target_node.clock_domain):
+                edge.crosses_clock_domain = True
+                edge.source_clock_domain = source_node.clock_domain
+                edge.target_clock_domain = target_node.clock_domain
 
-                    display_path.append(node.get_display_statement())
-                else:
 
-                    display_path.append(node.signal_name or node.name)
+                if edge.signal_width is None and source_node.signal_width is not None:
+                    edge.signal_width = source_node.signal_width
+            else:
+                edge.crosses_clock_domain = False
+                edge.source_clock_domain = None
+                edge.target_clock_domain = None
+
+            edge.is_multi_bit_cdc = (edge.crosses_clock_domain and
+                                     edge.signal_width is not None and
+                                     edge.signal_width > 1)
+
+            if self._compact is None:
+                self._nx_graph.edges[edge_key].update(
+                    crosses_clock_domain=edge.crosses_clock_domain,
+                    source_clock_domain=edge.source_clock_domain,
+                    target_clock_domain=edge.target_clock_domain,
+                    signal_width=edge.signal_width,
+                    is_multi_bit_cdc=edge.is_multi_bit_cdc)
+
+        self._track_cdc_edge(edge_key, edge)
+
+    def _get_cdc_edges(self) -> Dict[Tuple[str, str], Tuple[str, int, Tuple[str, str]]]:
+        if self._cdc_edges is None:
+            self._cdc_edges = {}
+            self._cdc_counters = dict.fromkeys(self._cdc_counters, 0)
+            self._cdc_domain_pairs = {}
+            for edge_key, edge in self.edges.items():
+                self._track_cdc_edge(edge_key, edge)
+        return self._cdc_edges
+
+    def _track_cdc_edge(self, edge_key: Tuple[str, str], edge: CodeStructureEdge):
+        if self._cdc_edges is None:
+            return
+
+        previous = self._cdc_edges.get(edge_key)
+        if previous is not None:
+            self._count_cdc_edge(previous, -1)
+
+        if edge.crosses_clock_domain:
+            width = edge.signal_width or 1
+            record = (self._evaluate_cdc_risk_level(width), width,
+                      (edge.source_clock_domain, edge.target_clock_domain))
+            self._cdc_edges[edge_key] = record
+            self._count_cdc_edge(record, 1)
+        elif previous is not None:
+            del self._cdc_edges[edge_key]
+
+    def _untrack_cdc_edge(self, edge_key: Tuple[str, str]):
+        if self._cdc_edges is None:
+            return
+
+        previous = self._cdc_edges.pop(edge_key, None)
+        if previous is not None:
+            self._count_cdc_edge(previous, -1)
+
+    def _count_cdc_edge(self, record: Tuple[str, int, Tuple[str, str]], delta: int):
+        risk_level, width, domain_pair = record
+
+        self._cdc_counters['total_cdc_edges'] += delta
+        if risk_level == "low":
+            self._cdc_counters['single_bit_cdc'] += delta
+        if width > 1:
+            self._cdc_counters['multi_bit_cdc'] += delta
+
+        count = self._cdc_domain_pairs.get(domain_pair, 0) + delta
+        if count:
+            self._cdc_domain_pairs[domain_pair] = count
+        else:
+            self._cdc_domain_pairs.pop(domain_pair, None)
+
+    def get_cdc_domain_pair_counts(self) -> Dict[Tuple[str, str], int]:
+        self._get_cdc_edges()
+        return dict(self._cdc_domain_pairs)
+
+    def _logic_cone(self, node_id: str, direction: str, max_depth: Optional[int],
+                    stop_at_registers: bool) -> Optional[LogicCone]:
+        if not self.has_graph_node(node_id):
+            return None
+
+        cache_key = (node_id, max_depth, direction, stop_at_registers)
+        cone = self._cone_cache.get(cache_key)
+        if cone is None:
+            neighbors = self._predecessors() if direction == FANIN else self._successors()
+            is_boundary = self._get_register_set().__contains__ if stop_at_registers else None
+            cone = extract_cone(neighbors, node_id, direction, max_depth, is_boundary)
+            self._cone_cache[cache_key] = cone
+        return cone
+
+    def fanin_cone(self, node_id: str, max_depth: Optional[int] = None,
+                   stop_at_registers: bool = True) -> Optional[LogicCone]:
+        return self._logic_cone(node_id, FANIN, max_depth, stop_at_registers)
+
+    def fanout_cone(self, node_id: str, max_depth: Optional[int] = None,
+                    stop_at_registers: bool = True) -> Optional[LogicCone]:
+        return self._logic_cone(node_id, FANOUT, max_depth, stop_at_registers)
+
+    def iter_cone_lines(self, cone: LogicCone) -> Iterator[str]:
+        direction = "扇入" if cone.direction == FANIN else "扇出"
+        depth_limit = cone.max_depth if cone.max_depth is not None else "无限制"
+        yield f"{self.get_node_display(cone.root)} 的{direction}锥 (深度限制: {depth_limit}, 节点数: {len(cone)}):"
+
+        for node_id in cone.nodes[1:]:
+            boundary_mark = " [寄存器边界]" if node_id in cone.boundary else ""
+            yield f"  [{cone.depth_of[node_id]}] {self.get_node_display(node_id)}{boundary_mark}"
+
+    def format_logic_cone(self, cone: LogicCone) -> str:
+        return '\n'.join(self.iter_cone_lines(cone))
+
+    def get_node_display(self, node_id: str) -> str:
+        display = self._display_cache.get(node_id)
+        if display is None:
+            node = self.nodes.get(node_id)
+            if node is None:
+                return node_id
+
+            if node.node_type == NodeType.LOGIC_BLOCK:
+                display = node.get_display_statement()
             else:
-                display_path.append(node_id)
+                display = node.signal_name or node.name
+            self._display_cache[node_id] = display
 
-        return display_path
+        return display
 
-    def format_violation_trace_output(self, trace_id: int, path_info: Dict) -> str:
-        output_lines = []
+    def invalidate_node_display(self, node_id: Optional[str] = None):
+        if node_id is None:
+            self._display_cache.clear()
+        else:
+            self._display_cache.pop(node_id, None)
 
+    def get_execution_trace_display(self, execution_path: List[str]) -> List[str]:
+        return [self.get_node_display(node_id) for node_id in execution_path]
+
+    def _order_cyclic_region(self, members: List[str]) -> List[str]:
+        member_set = set(members)
+        successors = self._successors()
+        ordered = []
+        visited = set()
+        stack = [members[0]]
+
+        while stack:
+            node_id = stack.pop()
+            if node_id in visited:
+                continue
+            visited.add(node_id)
+            ordered.append(node_id)
+            stack.extend(succ for succ in reversed(list(successors[node_id]))
+                         if succ in member_set and succ not in visited)
 
-        output_lines.append(f"违规轨迹 {trace_id}:")
+        return ordered
 
+    def _node_signal_label(self, node_id: str) -> str:
+        node = self.nodes.get(node_id)
+        if node is None:
+            return node_id
+        return node.signal_name or node.name
 
-        entry_point = path_info['entry_point']
-        if entry_point in self.nodes:
-            entry_signal = self.nodes[entry_point].signal_name or self.nodes[entry_point].name
-        else:
-            entry_signal = entry_point
-        output_lines.append(f"  入口点: {entry_signal}")
+    def iter_violation_trace_lines(self, trace_id: int, path_info: Dict) -> Iterator[str]:
+        yield f"违规轨迹 {trace_id}:"
+        yield f"  入口点: {self._node_signal_label(path_info['entry_point'])}"
+        yield f"  违规寄存器: {self._node_signal_label(path_info['violation_register'])}"
 
 
-        violation_register = path_info['violation_register']
-        if violation_register in self.nodes:
-            viol_signal = self.nodes[violation_register].signal_name or self.nodes[violation_register].name
-        else:
-            viol_signal = violation_register
-        output_lines.append(f"  违规寄存器: {viol_signal}")
+        display_path = self.get_execution_trace_display(path_info['execution_path'])
+        yield f"  执行路径: {' -> '.join(display_path)}"
 
+        for region in path_info.get('cyclic_regions', []):
+            loop_path = self.get_execution_trace_display(self._order_cyclic_region(region))
+            yield f"  反馈环路({len(loop_path)}个节点): {', '.join(loop_path)}"
 
-        execution_path = path_info['execution_path']
-        display_path = self.get_execution_trace_display(execution_path)
-        output_lines.append(f"  执行路径: {' -> '.join(display_path)}")
 
+        yield f"  路径长度: {path_info['path_length']}"
 
-        output_lines.append(f"  路径长度: {path_info['path_length']}")
+        if 'register_path' in path_info:
+            register_path = self.get_execution_trace_display(path_info['register_path'])
+            yield f"  寄存器路径: {' -> '.join(register_path)}"
+            yield f"  逻辑深度: {path_info['logic_depth']}"
 
 
         violations = path_info.get('violations', [])
-        output_lines.append(f"  该路径上的违规信息 ({len(violations)}个):")
+        yield f"  该路径上的违规信息 ({len(violations)}个):"
 
         for i, violation in enumerate(violations, 1):
-            output_lines.append(f"    违规{i}:")
-            output_lines.append(f"      违规类型: {violation['violation_type'].value}")
-            output_lines.append(f"      时序裕量: {violation.get('timing_slack', 'N/A')}ns")
-            output_lines.append(f"      起点->终点: {violation['startpoint']} -> {violation['endpoint']}")
-            output_lines.append(f"      要求时间: {violation.get('required_time', 'N/A')}ns")
-            output_lines.append(f"      到达时间: {violation.get('arrival_time', 'N/A')}ns")
-            output_lines.append(f"      路径组: {violation.get('path_group', 'N/A')}")
+            yield f"    违规{i}:"
+            yield f"      违规类型: {violation['violation_type'].value}"
+            yield f"      时序裕量: {violation.get('timing_slack', 'N/A')}ns"
+            yield f"      起点->终点: {violation['startpoint']} -> {violation['endpoint']}"
+            yield f"      要求时间: {violation.get('required_time', 'N/A')}ns"
+            yield f"      到达时间: {violation.get('arrival_time', 'N/A')}ns"
+            yield f"      路径组: {violation.get('path_group', 'N/A')}"
+
+    def format_violation_trace_output(self, trace_id: int, path_info: Dict) -> str:
+        return '\n'.join(self.iter_violation_trace_lines(trace_id, path_info))
+
+    def write_violation_traces(self, stream, path_infos: Iterable[Dict], first_trace_id: int = 1) -> int:
+        if hasattr(stream, 'write'):
+            write = stream.write
+        else:
+            def write(text: str):
+                stream.sendall(text.encode('utf-8'))
 
-        return '\n'.join(output_lines)
+        written = 0
+        for trace_id, path_info in enumerate(path_infos, first_trace_id):
+            if written:
+                write('\n')
+            for line in self.iter_violation_trace_lines(trace_id, path_info):
+                write(line)
+                write('\n')
+            written += 1
+
+        return written
 
 
     def _evaluate_cdc_risk_level(self, signal_width: Optional[int]) -> str:
@@ -300,12 +895,33 @@ class CodeStructureGraph:
         else:
             return "high"
 
-    def mark_violation_path(self, startpoint: str, endpoint: str, violation_info: ViolationInfo):
+    def mark_violation_path(self, startpoint: str, endpoint: str, violation_info: ViolationInfo) -> bool:
 
         if violation_info.violation_type == ViolationType.CDC:
             violation_info.cdc_risk_level = self._evaluate_cdc_risk_level(violation_info.signal_width)
 
 
+        path_key = (startpoint, endpoint, violation_info.violation_type)
+        position = self._violation_path_keys.get(path_key)
+        if position is not None:
+            recorded = self.violation_paths[position]['violation_info']
+            if violation_info.slack is None or (recorded.slack is not None and recorded.slack <= violation_info.slack):
+                return False
+            self.violation_paths[position]['violation_info'] = violation_info
+        else:
+            self._violation_path_keys[path_key] = len(self.violation_paths)
+            self.violation_paths.append({
+                'startpoint': startpoint,
+                'endpoint': endpoint,
+                'violation_info': violation_info
+            })
+        self._violation_slack_order = None
+        self._violation_launches = None
+
+
+        self._violation_marks[startpoint] = violation_info
+        self._violation_marks[endpoint] = violation_info
+
         if startpoint in self.nodes:
             self.nodes[startpoint].violation_info = violation_info
             self.violation_registers.add(startpoint)
@@ -314,36 +930,162 @@ class CodeStructureGraph:
             self.nodes[endpoint].violation_info = violation_info
             self.violation_registers.add(endpoint)
 
+        return True
 
-        violation_path_dict = {
-            'startpoint': startpoint,
-            'endpoint': endpoint,
-            'violation_info': violation_info
-        }
-        self.violation_paths.append(violation_path_dict)
+    def mark_violation_paths(self, violations: Iterable[Tuple[str, str, ViolationInfo]]) -> int:
+        mark_violation_path = self.mark_violation_path
+        return sum(1 for startpoint, endpoint, violation_info in violations
+                   if mark_violation_path(startpoint, endpoint, violation_info))
 
-    def find_entry_points(self, target_register: Optional[str] = None) -> List[str]:
-        entry_points = []
+    def load_sta_report(self, file_path: str, resolve: Optional[Callable[[str], str]] = None,
+                        violated_only: bool = True) -> int:
+        from sta_report import load_sta_report
+        return self.mark_violation_paths(load_sta_report(file_path, resolve, violated_only))
 
+    def get_violation_paths_by_slack(self, limit: Optional[int] = None) -> List[Dict]:
+        if self._violation_slack_order is None:
+            violation_paths = self.violation_paths
 
-        topological_entries = []
-        for node_id in self.nodes:
-            if len(list(self.graph.predecessors(node_id))) == 0:
-                topological_entries.append(node_id)
+            def slack_key(position: int) -> Tuple[bool, float]:
+                slack = violation_paths[position]['violation_info'].slack
+                return slack is None, 0.0 if slack is None else slack
 
+            self._violation_slack_order = sorted(range(len(violation_paths)), key=slack_key)
 
-        input_ports = []
-        for node_id, node in self.nodes.items():
-            if (node.node_type == NodeType.IO_PORT and
-                    node.properties.get('direction') == 'input'):
-                input_ports.append(node_id)
+        order = self._violation_slack_order if limit is None else self._violation_slack_order[:limit]
+        return [self.violation_paths[position] for position in order]
 
+    def _get_node_index(self) -> AttributeIndex:
+        if self._node_index is None:
+            self._node_index = AttributeIndex(NODE_INDEX_KEYS)
+            indexed_values = getattr(self.nodes, 'indexed_values', None)
+            if indexed_values is not None:
+                for node_id, values in indexed_values(NODE_INDEX_KEYS):
+                    self._node_index.add_values(node_id, values)
+            else:
+                for node_id, node in self.nodes.items():
+                    self._node_index.add(node_id, node)
+        return self._node_index
+
+    def _get_edge_index(self) -> AttributeIndex:
+        if self._edge_index is None:
+            self._edge_index = AttributeIndex(EDGE_INDEX_KEYS)
+            for edge_key, edge in self.edges.items():
+                self._edge_index.add(edge_key, edge)
+        return self._edge_index
+
+    def _get_domain_partitions(self) -> Dict[Optional[str], Dict[str, None]]:
+        return self._get_node_index().buckets('clock_domain')
+
+    def _get_register_set(self) -> Mapping[str, None]:
+        return self._get_node_index().bucket('node_type', NodeType.REGISTER)
+
+    def _index_node_partitions(self, node: CodeStructureNode):
+        self._domain_edges.pop(node.clock_domain, None)
+        if self._node_index is not None:
+            self._node_index.add(node.node_id, node)
+
+    def _unindex_node_partitions(self, node: CodeStructureNode):
+        self._domain_edges.pop(node.clock_domain, None)
+        if self._node_index is not None:
+            self._node_index.discard(node.node_id, node)
+
+    def select(self, **criteria) -> Iterator[CodeStructureNode]:
+        node_index = self._get_node_index()
+        candidates = node_index.candidates(criteria)
+        residual = {attribute: value for attribute, value in criteria.items() if attribute not in node_index}
+
+        if candidates is None:
+            return (node for node in self.nodes.values() if matches(node, residual))
+
+        nodes = (self.nodes.get(node_id) for node_id in candidates)
+        return (node for node in nodes if node is not None and matches(node, residual))
+
+    def _select_ids(self, **criteria) -> Iterator[str]:
+        node_index = self._get_node_index()
+        if criteria and all(attribute in node_index for attribute in criteria):
+            return node_index.candidates(criteria)
+        return (node.node_id for node in self.select(**criteria))
+
+    def select_edges(self, **criteria) -> Iterator[CodeStructureEdge]:
+        edge_index = self._get_edge_index()
+        candidates = edge_index.candidates(criteria)
+        residual = {attribute: value for attribute, value in criteria.items() if attribute not in edge_index}
+
+        if candidates is None:
+            return (edge for edge in self.edges.values() if matches(edge, residual))
+
+        edges = (self.edges.get(edge_key) for edge_key in candidates)
+        return (edge for edge in edges if edge is not None and matches(edge, residual))
+
+    def _invalidate_caches(self):
+        self._domain_edges.clear()
+        if self._compact is not None:
+            self._nx_graph = None
+        self._entry_candidates = None
+        self._reachability = None
+        self._condensation = None
+        self._timing_arcs = None
+        self._cone_cache.clear()
+        self._hierarchy_views.clear()
+
+    def freeze_for_search(self):
+        if self._compact is not None:
+            self._compact.csr(forward=True)
+        self.get_condensation()
+        self._get_entry_candidates()
+        self._get_reachability_index()
+        self._get_domain_partitions()
+
+    def _get_entry_candidates(self) -> Tuple[List[str], List[str], List[str]]:
+        if self._entry_candidates is None:
+            if self._compact is not None:
+                node_ids = self._compact.node_ids
+                topological_entries = [node_ids[index] for index in self._compact.source_rows()]
+            else:
+                topological_entries = [node_id for node_id in self.nodes if self._in_degree(node_id) == 0]
+            input_ports = list(self._select_ids(node_type=NodeType.IO_PORT, direction='input'))
+            reset_logic_entries = list(self._select_ids(node_type=NodeType.LOGIC_BLOCK, logic_type=LogicType.RESET))
+
+            self._entry_candidates = (topological_entries, input_ports, reset_logic_entries)
+
+        return self._entry_candidates
+
+    def _get_reachability_index(self) -> EntryReachabilityIndex:
+        if self._reachability is None:
+            topological_entries, input_ports, _ = self._get_entry_candidates()
+            self._reachability = EntryReachabilityIndex(self.get_condensation(), input_ports + topological_entries)
+        return self._reachability
+
+    def get_timing_arc_graph(self) -> TimingArcGraph:
+        if self._timing_arcs is None:
+            registers = self._get_register_set()
+            topological_entries, input_ports, _ = self._get_entry_candidates()
+
+            def is_logic_block(node_id: str) -> bool:
+                node = self.nodes.get(node_id)
+                return node is not None and node.node_type == NodeType.LOGIC_BLOCK
+
+            self._timing_arcs = TimingArcGraph(self._successors(),
+                                               launch_points=list(registers) + input_ports + topological_entries,
+                                               is_capture=registers.__contains__,
+                                               is_logic=is_logic_block)
+        return self._timing_arcs
+
+    def get_condensation(self) -> Condensation:
+        if self._condensation is None:
+            if self._compact is not None:
+                self._condensation = Condensation(self._compact.succ_rows, self._compact.iter_rows(),
+                                                  labels=self._compact.node_ids,
+                                                  labeled_successors=self._compact.succ)
+            else:
+                self._condensation = Condensation(self._successors(), self.iter_graph_node_ids())
+        return self._condensation
+
+    def find_entry_points(self, target_register: Optional[str] = None) -> List[str]:
+        entry_points = []
 
-        reset_logic_entries = []
-        for node_id, node in self.nodes.items():
-            if (node.node_type == NodeType.LOGIC_BLOCK and
-                    node.logic_type == LogicType.RESET):
-                reset_logic_entries.append(node_id)
+        topological_entries, input_ports, reset_logic_entries = self._get_entry_candidates()
 
 
         if target_register and target_register in self.nodes:
@@ -359,21 +1101,8 @@ class CodeStructureGraph:
                     domain_specific_entries.append(entry_id)
 
 
-            for entry_id in input_ports:
-
-                try:
-                    if nx.has_path(self.graph, entry_id, target_register):
-                        domain_specific_entries.append(entry_id)
-                except nx.NetworkXError:
-                    continue
-
-
-            for entry_id in topological_entries:
-                try:
-                    if nx.has_path(self.graph, entry_id, target_register):
-                        domain_specific_entries.append(entry_id)
-                except nx.NetworkXError:
-                    continue
+            domain_specific_entries.extend(
+                self._get_reachability_index().entries_reaching(target_register))
 
             if domain_specific_entries:
                 entry_points.extend(domain_specific_entries)
@@ -392,63 +1121,277 @@ class CodeStructureGraph:
                 entry_points.extend(topological_entries)
 
 
-        return list(set(entry_points))
+        return sorted(set(entry_points))
+
+    def _nodes_reaching(self, target: str) -> Set[str]:
+        return ancestors_of(self._predecessors(), target)
+
+    def _node_arrival_time(self, node_id: str) -> Optional[float]:
+        node = self.nodes.get(node_id)
+        if node is None:
+            return None
+
+        arrival_time = node.properties.get('arrival_time')
+        if arrival_time is None and node.violation_info.endpoint == node_id:
+            arrival_time = node.violation_info.arrival_time
+        return arrival_time
+
+    def get_path_edge_weight(self, source: str, target: str) -> float:
+        edge = self.edges.get((source, target))
+        if edge is not None and edge.properties.get('delay') is not None:
+            return max(float(edge.properties['delay']), 0.0)
+
+        source_arrival = self._node_arrival_time(source)
+        target_arrival = self._node_arrival_time(target)
+        if source_arrival is not None and target_arrival is not None:
+            return max(target_arrival - source_arrival, 0.0)
 
-    def find_execution_paths(self, start: str, end: str, max_paths: int = 10) -> List[List[str]]:
-        try:
+        target_node = self.nodes.get(target)
+        if target_node is not None and target_node.node_type == NodeType.LOGIC_BLOCK:
+            return 1.0
+        return 0.0
 
-            paths = list(nx.all_simple_paths(self.graph, start, end))
-            return paths[:max_paths]
-        except nx.NetworkXNoPath:
+    def find_execution_paths(self, start: str, end: str, max_paths: int = 10,
+                             max_depth: Optional[int] = None,
+                             time_limit: Optional[float] = None) -> List[List[str]]:
+        if not self.has_graph_node(start) or not self.has_graph_node(end):
+            return []
+
+        return bounded_simple_paths(self._successors(), start, end,
+                                    max_paths=max_paths,
+                                    max_depth=max_depth,
+                                    deadline=make_deadline(time_limit),
+                                    can_reach=self._nodes_reaching(end))
+
+    def find_full_execution_paths_to_violation(self, violation_register: str, max_paths: int = 10,
+                                               max_depth: Optional[int] = None,
+                                               time_limit: Optional[float] = None,
+                                               restrict_to_domain: bool = False,
+                                               ranked: bool = False,
+                                               collapse_cycles: bool = False,
+                                               use_timing_arcs: bool = False) -> List[Dict]:
+        if not self.has_graph_node(violation_register):
             return []
 
-    def find_full_execution_paths_to_violation(self, violation_register: str, max_paths: int = 10) -> List[Dict]:
         entry_points = self.find_entry_points(target_register=violation_register)
         full_execution_paths = []
 
+        deadline = make_deadline(time_limit)
+        if use_timing_arcs:
+            return self._find_timing_arc_paths(violation_register, entry_points, max_paths, max_depth, deadline,
+                                               restrict_to_domain)
+
+        if restrict_to_domain:
+            can_reach, boundary = self._domain_search_space(violation_register)
+            entry_points = self._domain_entry_points(violation_register, entry_points, can_reach, boundary)
+        else:
+            can_reach, boundary = self._nodes_reaching(violation_register), set()
+
+        if ranked:
+            sources = [entry_point for entry_point in entry_points
+                       if entry_point in can_reach or entry_point in boundary]
+            ranked_paths = heaviest_simple_paths(self._successors(), sources, violation_register,
+                                                 max_paths=max_paths,
+                                                 weight=self.get_path_edge_weight,
+                                                 can_reach=can_reach,
+                                                 max_depth=max_depth,
+                                                 deadline=deadline)
+
+            for path, path_weight in ranked_paths:
+                path_info = {
+                    'entry_point': path[0],
+                    'violation_register': violation_register,
+                    'execution_path': path,
+                    'path_length': len(path),
+                    'path_weight': path_weight
+                }
+                full_execution_paths.append(path_info)
+
+            return full_execution_paths
+
+        if collapse_cycles:
+            if restrict_to_domain:
+                condensation = Condensation(self._successors(), can_reach, within=can_reach)
+            else:
+                condensation = self.get_condensation()
+            return self._find_collapsed_paths(condensation, violation_register, entry_points, can_reach, boundary,
+                                              max_paths, max_depth, deadline)
+
         for entry_point in entry_points:
-            try:
+            if entry_point in can_reach:
+                search_space = can_reach
+            elif entry_point in boundary:
+                search_space = _SearchSpace(can_reach, entry_point)
+            else:
+                continue
 
-                paths = list(nx.all_simple_paths(self.graph, entry_point, violation_register))
+            paths = bounded_simple_paths(self._successors(), entry_point, violation_register,
+                                         max_paths=max_paths,
+                                         max_depth=max_depth,
+                                         deadline=deadline,
+                                         can_reach=search_space)
+
+            for path in paths:
+                path_info = {
+                    'entry_point': entry_point,
+                    'violation_register': violation_register,
+                    'execution_path': path,
+                    'path_length': len(path)
+                }
+                full_execution_paths.append(path_info)
+
+        return full_execution_paths
+
+    def _find_timing_arc_paths(self, violation_register: str, entry_points: List[str], max_paths: Optional[int],
+                               max_depth: Optional[int], deadline: Optional[float],
+                               restrict_to_domain: bool) -> List[Dict]:
+        arc_graph = self.get_timing_arc_graph()
+        if violation_register not in arc_graph:
+            return []
+
+        if restrict_to_domain:
+            can_reach, boundary = self._domain_search_space(violation_register, arc_graph.pred)
+            entry_points = self._domain_entry_points(violation_register, entry_points, can_reach, boundary)
+        else:
+            can_reach, boundary = ancestors_of(arc_graph.pred, violation_register), set()
+
+        full_execution_paths = []
+        for entry_point in entry_points:
+            if entry_point in can_reach:
+                search_space = can_reach
+            elif entry_point in boundary:
+                search_space = _SearchSpace(can_reach, entry_point)
+            else:
+                continue
+
+            register_paths = iter_simple_paths(arc_graph.succ, entry_point, violation_register,
+                                               max_depth, deadline, search_space)
+
+            found = 0
+            for register_path in register_paths:
+                if max_paths is not None and found >= max_paths:
+                    break
+                path = arc_graph.expand_path(register_path)
+                if path is None:
+                    continue
+
+                found += 1
+                path_info = {
+                    'entry_point': entry_point,
+                    'violation_register': violation_register,
+                    'execution_path': path,
+                    'path_length': len(path),
+                    'register_path': register_path,
+                    'logic_depth': arc_graph.logic_depth(register_path)
+                }
+                full_execution_paths.append(path_info)
+
+        return full_execution_paths
+
+    def _find_collapsed_paths(self, condensation: Condensation, violation_register: str, entry_points: List[str],
+                              can_reach: Set[str], boundary: Set[str], max_paths: Optional[int],
+                              max_depth: Optional[int], deadline: Optional[float]) -> List[Dict]:
+        successors = self._successors()
+        target_component = condensation.component_of[violation_register]
+        component_reach = condensation.ancestors(target_component)
+        full_execution_paths = []
+
+        for entry_point in entry_points:
+            if entry_point in can_reach:
+                starts = [(None, entry_point)]
+            elif entry_point in boundary:
+                starts = [(entry_point, child) for child in successors[entry_point] if child in can_reach]
+            else:
+                continue
+
+            found = 0
+            start_components = set()
+            for prefix, start in starts:
+                start_component = condensation.component_of[start]
+                if start_component in start_components:
+                    continue
+                start_components.add(start_component)
+
+                for component_path in iter_simple_paths(condensation.succ, start_component, target_component,
+                                                        max_depth, deadline, component_reach):
+                    if max_paths is not None and found >= max_paths:
+                        break
+
+                    path = condensation.expand_path(component_path, start, violation_register)
+                    if prefix is not None:
+                        path.insert(0, prefix)
 
-                for path in paths[:max_paths]:
                     path_info = {
                         'entry_point': entry_point,
                         'violation_register': violation_register,
                         'execution_path': path,
-                        'path_length': len(path)
+                        'path_length': len(path),
+                        'cyclic_regions': [condensation.members[component] for component in component_path
+                                           if condensation.is_cyclic(component)]
                     }
                     full_execution_paths.append(path_info)
-
-            except nx.NetworkXNoPath:
-                continue
+                    found += 1
 
         return full_execution_paths
 
-    def find_all_violation_execution_paths(self) -> List[Dict]:
+    def find_all_violation_execution_paths(self, max_paths: int = 10,
+                                           max_depth: Optional[int] = None,
+                                           time_limit: Optional[float] = None,
+                                           restrict_to_domain: bool = False,
+                                           workers: Optional[int] = None,
+                                           ranked: bool = False,
+                                           collapse_cycles: bool = False,
+                                           use_timing_arcs: bool = False) -> List[Dict]:
 
         violation_registers = set()
         for violation_path in self.violation_paths:
             violation_registers.add(violation_path['endpoint'])
 
+        violation_registers = sorted(violation_registers)
+        search_options = {
+            'max_paths': max_paths,
+            'max_depth': max_depth,
+            'time_limit': time_limit,
+            'restrict_to_domain': restrict_to_domain,
+            'ranked': ranked,
+            'collapse_cycles': collapse_cycles,
+            'use_timing_arcs': use_timing_arcs
+        }
 
-        unique_physical_paths = {}
+        if use_timing_arcs:
+            self.get_timing_arc_graph()
 
-        for violation_register in violation_registers:
-            full_paths = self.find_full_execution_paths_to_violation(violation_register)
+        worker_count = resolve_worker_count(workers)
+        if worker_count > 1 and len(violation_registers) > 1 and fork_available():
+            register_paths = search_registers_in_pool(self, violation_registers, search_options, worker_count)
+        else:
+            register_paths = (self.find_full_execution_paths_to_violation(violation_register, **search_options)
+                              for violation_register in violation_registers)
 
-            for full_path in full_paths:
 
-                path_key = (full_path['entry_point'], tuple(full_path['execution_path']))
+        seen_paths = PathTrie()
+        path_infos = []
 
-                if path_key not in unique_physical_paths:
-                    unique_physical_paths[path_key] = {
+        for violation_register, full_paths in zip(violation_registers, register_paths):
+            for full_path in full_paths:
+
+                if seen_paths.add(chain((full_path['entry_point'],), full_path['execution_path'])):
+                    path_info = {
                         'entry_point': full_path['entry_point'],
                         'violation_register': violation_register,
                         'execution_path': full_path['execution_path'],
                         'path_length': full_path['path_length'],
                         'violations': []
                     }
+                    for key in OPTIONAL_PATH_KEYS:
+                        if key in full_path:
+                            path_info[key] = full_path[key]
+                    path_infos.append(path_info)
+
+
+        path_index = PathPositionIndex()
+        for path_id, path_info in enumerate(path_infos):
+            path_index.add_path(path_id, path_info['execution_path'])
 
 
         for violation_path in self.violation_paths:
@@ -457,31 +1400,26 @@ class CodeStructureGraph:
             violation_info = violation_path['violation_info']
 
 
-            for path_key, path_info in unique_physical_paths.items():
-                execution_path = path_info['execution_path']
-
-
-                if (startpoint in execution_path and
-                        endpoint in execution_path and
-                        execution_path.index(startpoint) < execution_path.index(endpoint)):
-                    timing_info = {
-                        'violation_type': violation_info.violation_type,
-                        'timing_slack': violation_info.slack,
-                        'required_time': violation_info.required_time,
-                        'arrival_time': violation_info.arrival_time,
-                        'path_group': violation_info.path_group,
-                        'source_clock_domain': violation_info.source_clock_domain,
-                        'target_clock_domain': violation_info.target_clock_domain,
-                        'is_cross_clock_domain': violation_info.is_cross_clock_domain,
-                        'startpoint': startpoint,
-                        'endpoint': endpoint
-                    }
+            for path_id in path_index.paths_with_order(startpoint, endpoint):
+                path_info = path_infos[path_id]
+                timing_info = {
+                    'violation_type': violation_info.violation_type,
+                    'timing_slack': violation_info.slack,
+                    'required_time': violation_info.required_time,
+                    'arrival_time': violation_info.arrival_time,
+                    'path_group': violation_info.path_group,
+                    'source_clock_domain': violation_info.source_clock_domain,
+                    'target_clock_domain': violation_info.target_clock_domain,
+                    'is_cross_clock_domain': violation_info.is_cross_clock_domain,
+                    'startpoint': startpoint,
+                    'endpoint': endpoint
+                }
 
-                    path_info['violations'].append(timing_info)
+                path_info['violations'].append(timing_info)
 
 
         all_violation_paths = []
-        for path_info in unique_physical_paths.values():
+        for path_info in path_infos:
             if path_info['violations']:
                 violation_execution_path = {
                     'entry_point': path_info['entry_point'],
@@ -490,57 +1428,186 @@ class CodeStructureGraph:
                     'path_length': path_info['path_length'],
                     'violations': path_info['violations']
                 }
+                for key in OPTIONAL_PATH_KEYS:
+                    if key in path_info:
+                        violation_execution_path[key] = path_info[key]
                 all_violation_paths.append(violation_execution_path)
 
         return all_violation_paths
 
-    def get_clock_domains(self) -> Set[str]:
-        domains = set()
-        for node in self.nodes.values():
-            if node.clock_domain:
-                domains.add(node.clock_domain)
-        return domains
+    def add_module_template(self, template: ModuleTemplate):
+        self.module_templates[template.module_name] = template
+        self._hierarchy_views.clear()
+
+    def add_module_instance(self, instance: ModuleInstance):
+        self.module_instances[instance.node_id] = instance
+        self._hierarchy_views.clear()
+
+    def merge(self, nodes: Iterable[CodeStructureNode], edges: Iterable[CodeStructureEdge],
+              module_templates: Iterable[ModuleTemplate] = (), module_instances: Iterable[ModuleInstance] = ()):
+        for node in nodes:
+            self.add_node(node)
+        for edge in edges:
+            self.add_edge(edge)
+        for template in module_templates:
+            self.add_module_template(template)
+        for instance in module_instances:
+            self.add_module_instance(instance)
+
+    def merge_graph(self, other: 'CodeStructureGraph'):
+        self.merge(other.nodes.values(), other.edges.values(),
+                   other.module_templates.values(), other.module_instances.values())
+        self.mark_violation_paths((violation_path['startpoint'], violation_path['endpoint'],
+                                   violation_path['violation_info']) for violation_path in other.violation_paths)
+        self.source_files.update(other.source_files)
+
+    def get_top_modules(self) -> List[str]:
+        return top_modules(self.module_templates, self.module_instances.values())
+
+    def get_module_template_nodes(self, module_name: str) -> List[str]:
+        return [node.node_id for node in self.select(module_name=module_name)
+                if node.node_type != NodeType.MODULE]
+
+    def _node_module(self, node_id: str) -> Optional[str]:
+        node = self.nodes.get(node_id)
+        return node.module_name if node is not None else None
+
+    def _port_direction(self, node_id: str) -> Optional[str]:
+        node = self.nodes.get(node_id)
+        if node is None or node.node_type != NodeType.IO_PORT:
+            return None
+        return node.properties.get("direction")
+
+    def get_hierarchical_view(self, top: Optional[str] = None) -> Optional[HierarchicalView]:
+        if top is None:
+            top_candidates = self.get_top_modules()
+            if not top_candidates:
+                return None
+            top = top_candidates[0]
+        if top not in self.module_templates:
+            return None
+
+        view = self._hierarchy_views.get(top)
+        if view is None:
+            view = HierarchicalView(self._successors(), self._node_module, self._port_direction,
+                                    self.module_templates, self.module_instances.values(), top)
+            self._hierarchy_views[top] = view
+        return view
+
+    def find_hierarchical_paths(self, start: str, end: str, top: Optional[str] = None, max_paths: int = 10,
+                                max_depth: Optional[int] = None,
+                                time_limit: Optional[float] = None) -> List[List[str]]:
+        view = self.get_hierarchical_view(top)
+        if view is None:
+            return []
+
+        source = parse_hierarchical_node(start)
+        target = parse_hierarchical_node(end)
+        if source not in view or target not in view:
+            return []
 
-    def get_register_nodes(self) -> List[str]:
-        return [nid for nid, node in self.nodes.items()
-                if node.node_type == NodeType.REGISTER]
+        paths = bounded_simple_paths(view, source, target,
+                                     max_paths=max_paths,
+                                     max_depth=max_depth,
+                                     deadline=make_deadline(time_limit))
+        return [[format_hierarchical_node(node) for node in path] for path in paths]
+
+    def get_clock_domains(self) -> Set[str]:
+        return {domain for domain in self._get_domain_partitions() if domain}
+
+    def get_register_nodes(self, clock_domain: Optional[str] = None) -> List[str]:
+        registers = self._get_register_set()
+        if clock_domain is None:
+            return list(registers)
+        return [nid for nid in self._get_domain_partitions().get(clock_domain, ())
+                if nid in registers]
+
+    def get_domain_nodes(self, clock_domain: Optional[str]) -> List[str]:
+        return list(self._get_domain_partitions().get(clock_domain, ()))
+
+    def get_domain_edges(self, clock_domain: Optional[str]) -> List[Tuple[str, str]]:
+        if clock_domain not in self._domain_edges:
+            members = self._get_domain_partitions().get(clock_domain, {})
+            successors = self._successors()
+            self._domain_edges[clock_domain] = [(node_id, succ)
+                                                for node_id in members
+                                                if self.has_graph_node(node_id)
+                                                for succ in successors[node_id]
+                                                if succ in members]
+        return self._domain_edges[clock_domain]
+
+    def domain_subgraph(self, clock_domain: Optional[str], include_unclocked: bool = False) -> nx.DiGraph:
+        partitions = self._get_domain_partitions()
+        members = partitions.get(clock_domain, {})
+        unclocked = partitions.get(None, {}) if include_unclocked else {}
+        return nx.subgraph_view(self.graph,
+                                filter_node=lambda node_id: node_id in members or node_id in unclocked)
+
+    def _launch_domains(self, capture_register: str) -> Set[str]:
+        if self._violation_launches is None:
+            self._violation_launches = {}
+            for violation_path in self.violation_paths:
+                self._violation_launches.setdefault(violation_path['endpoint'], []).append(
+                    (violation_path['startpoint'], violation_path['violation_info'].source_clock_domain))
+
+        launch_domains = set()
+        for startpoint, source_clock_domain in self._violation_launches.get(capture_register, ()):
+            if source_clock_domain is not None:
+                launch_domains.add(source_clock_domain)
+            startpoint_node = self.nodes.get(startpoint)
+            if startpoint_node is not None and startpoint_node.clock_domain is not None:
+                launch_domains.add(startpoint_node.clock_domain)
+        return launch_domains
+
+    def _domain_entry_points(self, target: str, entry_points: List[str], can_reach: Set[str],
+                             boundary: Set[str]) -> List[str]:
+        if any(entry_point in can_reach or entry_point in boundary for entry_point in entry_points):
+            return entry_points
+
+        self._launch_domains(target)
+        startpoints = [startpoint for startpoint, _ in self._violation_launches.get(target, ())
+                       if startpoint != target and (startpoint in can_reach or startpoint in boundary)]
+        return list(dict.fromkeys(chain(startpoints, sorted(boundary))))
+
+    def _domain_search_space(self, target: str,
+                             predecessors: Optional[Mapping] = None) -> Tuple[Set[str], Set[str]]:
+        if predecessors is None:
+            predecessors = self._predecessors()
+
+        target_domain = self.nodes[target].clock_domain if target in self.nodes else None
+        if target_domain is None:
+            return ancestors_of(predecessors, target), set()
+
+        search_domains = {target_domain} | self._launch_domains(target)
+
+        def in_search_domain(node_id: str) -> bool:
+            node = self.nodes.get(node_id)
+            return node is None or node.clock_domain is None or node.clock_domain in search_domains
+
+        return ancestors_within(predecessors, target, in_search_domain)
 
     def analyze_multi_bit_cdc_risks(self) -> Dict:
-        cdc_analysis = {
-            'total_cdc_edges': 0,
-            'single_bit_cdc': 0,
-            'multi_bit_cdc': 0,
+        cdc_edges = self._get_cdc_edges()
+        cdc_analysis = dict(self._cdc_counters)
+        cdc_analysis.update({
             'high_risk_cdc': [],
             'medium_risk_cdc': [],
-            'low_risk_cdc': []
-        }
-
-
-        for edge_key, edge in self.edges.items():
-            if edge.crosses_clock_domain:
-                cdc_analysis['total_cdc_edges'] += 1
+            'low_risk_cdc': [],
+            'cdc_domain_pairs': self.get_cdc_domain_pair_counts()
+        })
 
-                width = edge.signal_width or 1
-                risk_level = self._evaluate_cdc_risk_level(width)
-
-                cdc_info = {
-                    'edge': edge_key,
-                    'signal_name': edge.signal_name,
-                    'width': width,
-                    'source_domain': edge.source_clock_domain,
-                    'target_domain': edge.target_clock_domain,
-                    'source_location': edge.source_info.get_location_string()
-                }
 
-                if risk_level == "high":
-                    cdc_analysis['high_risk_cdc'].append(cdc_info)
-                elif risk_level == "medium":
-                    cdc_analysis['medium_risk_cdc'].append(cdc_info)
-                else:
-                    cdc_analysis['low_risk_cdc'].append(cdc_info)
-                    cdc_analysis['single_bit_cdc'] += 1
+        for edge_key, (risk_level, width, _) in cdc_edges.items():
+            edge = self.edges[edge_key]
+            cdc_info = {
+                'edge': edge_key,
+                'signal_name': edge.signal_name,
+                'width': width,
+                'source_domain': edge.source_clock_domain,
+                'target_domain': edge.target_clock_domain,
+                'source_location': edge.source_info.get_location_string()
+            }
 
-                if width > 1:
-                    cdc_analysis['multi_bit_cdc'] += 1
+            cdc_analysis[f'{risk_level}_risk_cdc'].append(cdc_info)
 
-        return cdc_analysis
\ No newline at end of file
+        return cdc_analysis
@@ -0,0 +1,690 @@
+import json
+import mmap
+import struct
+import sys
+import zlib
+from abc import abstractmethod
+from array import array
+from collections.abc import MutableMapping
+from dataclasses import fields
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from compact_graph import CompactGraph, build_csr
+from hierarchy import ModuleInstance, ModuleTemplate
+from source_index import SourceFileIndex
+from stdg import (
+    CodeStructureGraph, CodeStructureNode, CodeStructureEdge, SourceCodeInfo, ViolationInfo,
+    NodeType, EdgeType, LogicType, ViolationType, EMPTY_SOURCE_INFO, EMPTY_VIOLATION_INFO, NODE_TYPE_CODES
+)
+
+
+MAGIC = b'STDG'
+FORMAT_VERSION = 2
+NO_VALUE = -1
+
+NODE_COLUMNS = ('node_id', 'node_type', 'name', 'module_name', 'signal_name', 'signal_width',
+                'signal_range', 'domain_id', 'logic_type', 'file_path', 'line_number',
+                'raw_statement', 'formatted_statement', 'extra', 'direction')
+EDGE_COLUMNS = ('source', 'target', 'edge_type', 'signal_name', 'condition', 'signal_width',
+                'file_path', 'line_number', 'raw_statement', 'flags',
+                'source_clock_domain', 'target_clock_domain', 'extra')
+SECTIONS = ('string_offsets', 'string_data', 'node_columns', 'node_order', 'edge_columns',
+            'edge_order', 'succ_offsets', 'succ_targets', 'pred_offsets', 'pred_sources')
+
+_HEADER = struct.Struct('<4sIIIIIII')
+_SECTION = struct.Struct('<QQ')
+_ALIGNMENT = 8
+
+_NODE_TYPES = list(NodeType)
+_EDGE_TYPES = list(EdgeType)
+_LOGIC_TYPES = list(LogicType)
+_EDGE_TYPE_CODES = {edge_type: code for code, edge_type in enumerate(_EDGE_TYPES)}
+_LOGIC_TYPE_CODES = {logic_type: code for code, logic_type in enumerate(_LOGIC_TYPES)}
+
+_NODE_EXTRA_FIELDS = ('clock_edge', 'reset_signal', 'reset_type', 'assignment_target', 'condition_expression')
+_SOURCE_EXTRA_FIELDS = ('column_start', 'column_end', 'statement_type')
+
+_INDEXED_NODE_ATTRIBUTES = frozenset(('node_type', 'logic_type', 'clock_domain', 'module_name', 'direction'))
+_DIRECTION_IN_EXTRA = -2
+
+_CROSSES_CLOCK_DOMAIN = 1
+_MULTI_BIT_CDC = 2
+
+
+class GraphFileVersionError(ValueError):
+    pass
+
+
+def _schema_fingerprint() -> int:
+    parts: List[Any] = [sys.byteorder, NODE_COLUMNS, EDGE_COLUMNS, SECTIONS]
+    for cls in (CodeStructureNode, CodeStructureEdge, SourceCodeInfo, ViolationInfo):
+        parts.append(tuple(f.name for f in fields(cls)))
+    for enum_cls in (NodeType, EdgeType, LogicType, ViolationType):
+        parts.append(tuple(member.value for member in enum_cls))
+    return zlib.crc32(repr(parts).encode('utf-8'))
+
+
+SCHEMA_FINGERPRINT = _schema_fingerprint()
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _int_or_none(value: Optional[int]) -> int:
+    return NO_VALUE if value is None else value
+
+
+def _none_or_int(value: int) -> Optional[int]:
+    return None if value == NO_VALUE else value
+
+
+def _violation_to_json(info: ViolationInfo) -> Dict:
+    data = {f.name: getattr(info, f.name) for f in fields(ViolationInfo)}
+    data['violation_type'] = info.violation_type.value
+    return data
+
+
+def _violation_from_json(data: Dict) -> ViolationInfo:
+    data = dict(data)
+    data['violation_type'] = ViolationType(data['violation_type'])
+    return ViolationInfo(**data)
+
+
+class _StringTableBuilder:
+
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_VALUE
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.strings)
+            self._index[value] = index
+            self.strings.append(value)
+        return index
+
+    def to_sections(self) -> Tuple[bytes, bytes]:
+        offsets = array('Q', [0])
+        chunks = []
+        total = 0
+        for value in self.strings:
+            encoded = value.encode('utf-8')
+            chunks.append(encoded)
+            total += len(encoded)
+            offsets.append(total)
+        return offsets.tobytes(), b''.join(chunks)
+
+
+def _encode_source(source: SourceCodeInfo, strings: _StringTableBuilder, extra: Dict) -> List[int]:
+    if source is EMPTY_SOURCE_INFO:
+        return [NO_VALUE, 0, NO_VALUE]
+
+    extra['source_info'] = {name: getattr(source, name) for name in _SOURCE_EXTRA_FIELDS}
+    return [strings.add(source.file_path), source.line_number, strings.add(source.raw_statement)]
+
+
+def _encode_node(node: CodeStructureNode, strings: _StringTableBuilder, compact_domain: int) -> List[int]:
+    extra = {name: getattr(node, name) for name in _NODE_EXTRA_FIELDS if getattr(node, name) is not None}
+    if node.is_multi_bit and not (node.signal_width is not None and node.signal_width > 1):
+        extra['is_multi_bit'] = True
+    if node.assignment_sources:
+        extra['assignment_sources'] = list(node.assignment_sources)
+    if node.properties:
+        extra['properties'] = dict(node.properties)
+    if node.violation_info is not EMPTY_VIOLATION_INFO:
+        extra['violation_info'] = _violation_to_json(node.violation_info)
+
+    file_path, line_number, raw_statement = _encode_source(node.source_info, strings, extra)
+    formatted_statement = (NO_VALUE if node.source_info is EMPTY_SOURCE_INFO
+                           else strings.add(node.source_info.formatted_statement))
+
+    direction = node.properties.get('direction')
+    if direction is None or isinstance(direction, str):
+        direction = strings.add(direction)
+    else:
+        direction = _DIRECTION_IN_EXTRA
+
+    return [strings.add(node.node_id), NODE_TYPE_CODES[node.node_type], strings.add(node.name),
+            strings.add(node.module_name), strings.add(node.signal_name), _int_or_none(node.signal_width),
+            strings.add(node.signal_range), compact_domain, _LOGIC_TYPE_CODES[node.logic_type],
+            file_path, line_number, raw_statement, formatted_statement,
+            strings.add(json.dumps(extra)) if extra else NO_VALUE, direction]
+
+
+def _encode_placeholder(node_id: str, strings: _StringTableBuilder) -> List[int]:
+    row = [NO_VALUE] * len(NODE_COLUMNS)
+    row[0] = strings.add(node_id)
+    row[NODE_COLUMNS.index('line_number')] = 0
+    return row
+
+
+def _encode_edge(edge: CodeStructureEdge, source_row: int, target_row: int,
+                 strings: _StringTableBuilder) -> List[int]:
+    extra = {}
+    if edge.properties:
+        extra['properties'] = dict(edge.properties)
+    if edge.source_info is not EMPTY_SOURCE_INFO and edge.source_info.formatted_statement:
+        extra['formatted_statement'] = edge.source_info.formatted_statement
+
+    file_path, line_number, raw_statement = _encode_source(edge.source_info, strings, extra)
+    flags = ((_CROSSES_CLOCK_DOMAIN if edge.crosses_clock_domain else 0) |
+             (_MULTI_BIT_CDC if edge.is_multi_bit_cdc else 0))
+
+    return [source_row, target_row, _EDGE_TYPE_CODES[edge.edge_type], strings.add(edge.signal_name),
+            strings.add(edge.condition), _int_or_none(edge.signal_width),
+            file_path, line_number, raw_statement, flags,
+            strings.add(edge.source_clock_domain), strings.add(edge.target_clock_domain),
+            strings.add(json.dumps(extra)) if extra else NO_VALUE]
+
+
+def _columns_to_bytes(rows: List[List[int]], column_count: int) -> bytes:
+    columns = [array('i', (row[c] for row in rows)) for c in range(column_count)]
+    return b''.join(column.tobytes() for column in columns)
+
+
+def save_graph(graph: CodeStructureGraph, file_path: str):
+    strings = _StringTableBuilder()
+    domain_names: List[str] = []
+    domain_ids: Dict[str, int] = {}
+
+    node_rows: List[List[int]] = []
+    row_of: Dict[str, int] = {}
+
+    for node_id, node in graph.nodes.items():
+        compact_domain = NO_VALUE
+        if node.clock_domain is not None:
+            compact_domain = domain_ids.setdefault(node.clock_domain, len(domain_ids))
+            if compact_domain == len(domain_names):
+                domain_names.append(node.clock_domain)
+
+        row_of[node_id] = len(node_rows)
+        node_rows.append(_encode_node(node, strings, compact_domain))
+
+    placeholder_count = 0
+    for node_id in graph.iter_graph_node_ids():
+        if node_id not in row_of:
+            row_of[node_id] = len(node_rows)
+            node_rows.append(_encode_placeholder(node_id, strings))
+            placeholder_count += 1
+
+    edge_rows = [_encode_edge(edge, row_of[source], row_of[target], strings)
+                 for (source, target), edge in graph.edges.items()]
+
+
+    meta = {
+        'domain_names': domain_names,
+        'violation_registers': sorted(graph.violation_registers),
+        'violation_paths': [{'startpoint': path['startpoint'],
+                             'endpoint': path['endpoint'],
+                             'violation_info': _violation_to_json(path['violation_info'])}
+                            for path in graph.violation_paths],
+        'source_files': {path: strings.add(source.text) for path, source in graph.source_files.items()},
+        'module_templates': [[template.module_name, template.node_id, template.ports]
+                             for template in graph.module_templates.values()],
+        'module_instances': [[instance.node_id, instance.name, instance.module_name, instance.parent_module,
+                              instance.named_bindings, instance.ordered_bindings]
+                             for instance in graph.module_instances.values()]
+    }
+    meta_index = strings.add(json.dumps(meta))
+
+
+    node_count = len(node_rows)
+    edge_count = len(edge_rows)
+    node_ids = [strings.strings[row[0]] for row in node_rows]
+    edge_sources = array('i', (row[0] for row in edge_rows))
+    edge_targets = array('i', (row[1] for row in edge_rows))
+
+    node_order = array('i', sorted(range(node_count), key=node_ids.__getitem__))
+    edge_order = array('i', sorted(range(edge_count), key=lambda j: (edge_sources[j], edge_targets[j])))
+    succ_offsets, succ_targets = build_csr(node_count, edge_sources, edge_targets)
+    pred_offsets, pred_sources = build_csr(node_count, edge_targets, edge_sources)
+    string_offsets, string_data = strings.to_sections()
+
+    sections = {
+        'string_offsets': string_offsets,
+        'string_data': string_data,
+        'node_columns': _columns_to_bytes(node_rows, len(NODE_COLUMNS)),
+        'node_order': node_order.tobytes(),
+        'edge_columns': _columns_to_bytes(edge_rows, len(EDGE_COLUMNS)),
+        'edge_order': edge_order.tobytes(),
+        'succ_offsets': succ_offsets.tobytes(),
+        'succ_targets': succ_targets.tobytes(),
+        'pred_offsets': pred_offsets.tobytes(),
+        'pred_sources': pred_sources.tobytes()
+    }
+
+
+    with open(file_path, 'wb') as f:
+        offset = _aligned(_HEADER.size + _SECTION.size * len(SECTIONS))
+        f.write(b'\0' * offset)
+
+        section_table = []
+        for name in SECTIONS:
+            data = sections[name]
+            padding = _aligned(len(data)) - len(data)
+            f.write(data)
+            f.write(b'\0' * padding)
+            section_table.append((offset, len(data)))
+            offset += len(data) + padding
+
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, SCHEMA_FINGERPRINT, node_count, edge_count,
+                             len(strings.strings), meta_index, placeholder_count))
+        for section_offset, length in section_table:
+            f.write(_SECTION.pack(section_offset, length))
+
+
+class MappedGraphFile:
+
+    def __init__(self, file_path: str):
+        with open(file_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"不是有效的STDG图文件: {file_path}")
+
+        (magic, version, schema, self.node_count, self.edge_count,
+         self.string_count, meta_index, self.placeholder_count) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"不是有效的STDG图文件: {file_path}")
+        if version != FORMAT_VERSION or schema != SCHEMA_FINGERPRINT:
+            raise GraphFileVersionError(
+                f"STDG图文件版本不匹配(文件版本 {version}, 当前版本 {FORMAT_VERSION}), 请重新生成: {file_path}")
+
+        view = memoryview(self._mmap)
+        sections = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = _SECTION.unpack_from(self._mmap, _HEADER.size + i * _SECTION.size)
+            sections[name] = view[offset:offset + length]
+
+        self.string_offsets = sections['string_offsets'].cast('Q')
+        self.string_data = sections['string_data']
+
+        node_columns = sections['node_columns'].cast('i')
+        self.node_columns = {name: node_columns[i * self.node_count:(i + 1) * self.node_count]
+                             for i, name in enumerate(NODE_COLUMNS)}
+        edge_columns = sections['edge_columns'].cast('i')
+        self.edge_columns = {name: edge_columns[i * self.edge_count:(i + 1) * self.edge_count]
+                             for i, name in enumerate(EDGE_COLUMNS)}
+
+        self.node_order = sections['node_order'].cast('i')
+        self.edge_order = sections['edge_order'].cast('i')
+        self.succ_csr = (sections['succ_offsets'].cast('i'), sections['succ_targets'].cast('i'))
+        self.pred_csr = (sections['pred_offsets'].cast('i'), sections['pred_sources'].cast('i'))
+
+        self.string = lru_cache(maxsize=65536)(self._decode_string)
+        self.meta = json.loads(self.string(meta_index))
+        self._node_rows: Dict[str, int] = {}
+
+    def _decode_string(self, index: int) -> Optional[str]:
+        if index == NO_VALUE:
+            return None
+        start = self.string_offsets[index]
+        end = self.string_offsets[index + 1]
+        return str(self.string_data[start:end], 'utf-8')
+
+    def string_bytes(self, index: int) -> bytes:
+        return bytes(self.string_data[self.string_offsets[index]:self.string_offsets[index + 1]])
+
+    def node_id(self, row: int) -> str:
+        node_id = self.string(self.node_columns['node_id'][row])
+        self._node_rows[node_id] = row
+        return node_id
+
+    def is_placeholder(self, row: int) -> bool:
+        return self.node_columns['node_type'][row] == NO_VALUE
+
+    def find_node_row(self, node_id: str) -> Optional[int]:
+        row = self._node_rows.get(node_id)
+        if row is not None:
+            return row
+
+        order = self.node_order
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.node_id(order[mid]) < node_id:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo < len(order) and self.node_id(order[lo]) == node_id:
+            return order[lo]
+        return None
+
+    def find_edge_row(self, source_row: int, target_row: int) -> Optional[int]:
+        order = self.edge_order
+        sources = self.edge_columns['source']
+        targets = self.edge_columns['target']
+        key = (source_row, target_row)
+
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (sources[order[mid]], targets[order[mid]]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo < len(order) and (sources[order[lo]], targets[order[lo]]) == key:
+            return order[lo]
+        return None
+
+    def edge_key(self, row: int) -> Tuple[str, str]:
+        return (self.node_id(self.edge_columns['source'][row]),
+                self.node_id(self.edge_columns['target'][row]))
+
+    def _extra(self, index: int) -> Dict:
+        return json.loads(self.string(index)) if index != NO_VALUE else {}
+
+    def _source_info(self, columns: Dict[str, Sequence[int]], row: int, extra: Dict,
+                     formatted_statement: Optional[str]) -> Optional[SourceCodeInfo]:
+        if 'source_info' not in extra:
+            return None
+        return SourceCodeInfo(file_path=self.string(columns['file_path'][row]),
+                              line_number=columns['line_number'][row],
+                              raw_statement=self.string(columns['raw_statement'][row]),
+                              formatted_statement=formatted_statement or "",
+                              **extra['source_info'])
+
+    def node_index_values(self, row: int) -> Dict[str, Any]:
+        columns = self.node_columns
+        domain_id = columns['domain_id'][row]
+        direction = columns['direction'][row]
+        if direction == _DIRECTION_IN_EXTRA:
+            direction = self._extra(columns['extra'][row])['properties']['direction']
+        else:
+            direction = self.string(direction)
+
+        return {
+            'node_type': _NODE_TYPES[columns['node_type'][row]],
+            'logic_type': _LOGIC_TYPES[columns['logic_type'][row]],
+            'clock_domain': None if domain_id == NO_VALUE else self.meta['domain_names'][domain_id],
+            'module_name': self.string(columns['module_name'][row]),
+            'direction': direction
+        }
+
+    def node(self, row: int) -> CodeStructureNode:
+        columns = self.node_columns
+        extra = self._extra(columns['extra'][row])
+        domain_id = columns['domain_id'][row]
+        violation_info = extra.pop('violation_info', None)
+
+        return CodeStructureNode(
+            node_id=self.node_id(row),
+            node_type=_NODE_TYPES[columns['node_type'][row]],
+            name=self.string(columns['name'][row]),
+            source_info=self._source_info(columns, row, extra,
+                                          self.string(columns['formatted_statement'][row])),
+            module_name=self.string(columns['module_name'][row]),
+            signal_name=self.string(columns['signal_name'][row]),
+            signal_width=_none_or_int(columns['signal_width'][row]),
+            signal_range=self.string(columns['signal_range'][row]),
+            is_multi_bit=extra.get('is_multi_bit', False),
+            clock_domain=None if domain_id == NO_VALUE else self.meta['domain_names'][domain_id],
+            logic_type=_LOGIC_TYPES[columns['logic_type'][row]],
+            assignment_sources=extra.get('assignment_sources'),
+            violation_info=_violation_from_json(violation_info) if violation_info else None,
+            properties=extra.get('properties'),
+            **{name: extra.get(name) for name in _NODE_EXTRA_FIELDS}
+        )
+
+    def edge(self, row: int) -> CodeStructureEdge:
+        columns = self.edge_columns
+        extra = self._extra(columns['extra'][row])
+        flags = columns['flags'][row]
+        source, target = self.edge_key(row)
+
+        return CodeStructureEdge(
+            source=source,
+            target=target,
+            edge_type=_EDGE_TYPES[columns['edge_type'][row]],
+            signal_name=self.string(columns['signal_name'][row]),
+            condition=self.string(columns['condition'][row]),
+            signal_width=_none_or_int(columns['signal_width'][row]),
+            source_info=self._source_info(columns, row, extra, extra.get('formatted_statement')),
+            crosses_clock_domain=bool(flags & _CROSSES_CLOCK_DOMAIN),
+            source_clock_domain=self.string(columns['source_clock_domain'][row]),
+            target_clock_domain=self.string(columns['target_clock_domain'][row]),
+            is_multi_bit_cdc=bool(flags & _MULTI_BIT_CDC),
+            properties=extra.get('properties')
+        )
+
+    def compact_graph(self) -> CompactGraph:
+        return CompactGraph.from_columns(
+            node_ids=_MappedNodeIds(self),
+            index=_MappedNodeIndex(self),
+            node_type=self.node_columns['node_type'],
+            clock_domain=self.node_columns['domain_id'],
+            width=self.node_columns['signal_width'],
+            domain_names=self.meta['domain_names'],
+            edge_sources=self.edge_columns['source'],
+            edge_targets=self.edge_columns['target'],
+            succ_csr=self.succ_csr,
+            pred_csr=self.pred_csr
+        )
+
+
+class _MappedNodeIds(Sequence):
+
+    def __init__(self, mapped: MappedGraphFile):
+        self._mapped = mapped
+
+    def __getitem__(self, row: int) -> str:
+        return self._mapped.node_id(row)
+
+    def __len__(self) -> int:
+        return self._mapped.node_count
+
+
+class _MappedNodeIndex:
+
+    def __init__(self, mapped: MappedGraphFile):
+        self._mapped = mapped
+
+    def get(self, node_id: str, default: Optional[int] = None) -> Optional[int]:
+        row = self._mapped.find_node_row(node_id)
+        return default if row is None else row
+
+    def __getitem__(self, node_id: str) -> int:
+        row = self._mapped.find_node_row(node_id)
+        if row is None:
+            raise KeyError(node_id)
+        return row
+
+    def __contains__(self, node_id: str) -> bool:
+        return self._mapped.find_node_row(node_id) is not None
+
+
+class _MappedTable(MutableMapping):
+
+    def __init__(self, mapped: MappedGraphFile, stored_count: int):
+        self._mapped = mapped
+        self._stored_count = stored_count
+        self._overrides: Dict[Any, Any] = {}
+        self._appended: Dict[Any, None] = {}
+        self._deleted_stored: Set[Any] = set()
+
+    @abstractmethod
+    def _stored_row(self, key) -> Optional[int]:
+        ...
+
+    @abstractmethod
+    def _stored_key(self, row: int):
+        ...
+
+    @abstractmethod
+    def _stored_rows(self) -> Iterator[int]:
+        ...
+
+    @abstractmethod
+    def _materialize(self, row: int):
+        ...
+
+    def __contains__(self, key) -> bool:
+        if key in self._overrides:
+            return self._overrides[key] is not None
+        return self._stored_row(key) is not None
+
+    def __getitem__(self, key):
+        if key in self._overrides:
+            value = self._overrides[key]
+            if value is None:
+                raise KeyError(key)
+            return value
+
+        row = self._stored_row(key)
+        if row is None:
+            raise KeyError(key)
+        value = self._materialize(row)
+        self._overrides[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._deleted_stored:
+            self._deleted_stored.discard(key)
+        elif key not in self._overrides and self._stored_row(key) is None:
+            self._appended[key] = None
+        self._overrides[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in self._appended:
+            del self._appended[key]
+            del self._overrides[key]
+        else:
+            self._overrides[key] = None
+            self._deleted_stored.add(key)
+
+    def __len__(self) -> int:
+        return self._stored_count - len(self._deleted_stored) + len(self._appended)
+
+    def __iter__(self) -> Iterator:
+        for key, _ in self._iter_stored():
+            yield key
+        yield from list(self._appended)
+
+    def _iter_stored(self) -> Iterator[Tuple[Any, int]]:
+        for row in self._stored_rows():
+            key = self._stored_key(row)
+            if key not in self._deleted_stored:
+                yield key, row
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        for key, row in self._iter_stored():
+            value = self._overrides.get(key)
+            if value is None:
+                value = self._materialize(row)
+                self._overrides[key] = value
+            yield key, value
+        for key in list(self._appended):
+            yield key, self._overrides[key]
+
+    def values(self) -> Iterator[Any]:
+        return (value for _, value in self.items())
+
+
+class _MappedNodeTable(_MappedTable):
+
+    def __init__(self, mapped: MappedGraphFile):
+        super().__init__(mapped, mapped.node_count - mapped.placeholder_count)
+
+    def _stored_row(self, node_id: str) -> Optional[int]:
+        row = self._mapped.find_node_row(node_id)
+        if row is None or self._mapped.is_placeholder(row):
+            return None
+        return row
+
+    def _stored_key(self, row: int) -> str:
+        return self._mapped.node_id(row)
+
+    def _stored_rows(self) -> Iterator[int]:
+        return (row for row in range(self._mapped.node_count) if not self._mapped.is_placeholder(row))
+
+    def _materialize(self, row: int) -> CodeStructureNode:
+        return self._mapped.node(row)
+
+    def indexed_values(self, key_functions: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        if not _INDEXED_NODE_ATTRIBUTES.issuperset(key_functions):
+            for node_id, node in self.items():
+                yield node_id, {attribute: key(node) for attribute, key in key_functions.items()}
+            return
+
+        for node_id, row in self._iter_stored():
+            node = self._overrides.get(node_id)
+            if node is None:
+                yield node_id, self._mapped.node_index_values(row)
+            else:
+                yield node_id, {attribute: key(node) for attribute, key in key_functions.items()}
+        for node_id in list(self._appended):
+            node = self._overrides[node_id]
+            yield node_id, {attribute: key(node) for attribute, key in key_functions.items()}
+
+
+class _MappedEdgeTable(_MappedTable):
+
+    def __init__(self, mapped: MappedGraphFile):
+        super().__init__(mapped, mapped.edge_count)
+
+    def _stored_row(self, edge_key: Tuple[str, str]) -> Optional[int]:
+        source_row = self._mapped.find_node_row(edge_key[0])
+        target_row = self._mapped.find_node_row(edge_key[1])
+        if source_row is None or target_row is None:
+            return None
+        return self._mapped.find_edge_row(source_row, target_row)
+
+    def _stored_key(self, row: int) -> Tuple[str, str]:
+        return self._mapped.edge_key(row)
+
+    def _stored_rows(self) -> Iterator[int]:
+        return iter(range(self._mapped.edge_count))
+
+    def _materialize(self, row: int) -> CodeStructureEdge:
+        return self._mapped.edge(row)
+
+
+class _MappedSourceFile(SourceFileIndex):
+
+    def __init__(self, mapped: MappedGraphFile, string_index: int):
+        self._mapped = mapped
+        self._string_index = string_index
+
+    def __getattr__(self, name: str):
+        if name in ('_buffer', '_offsets', 'encoding', 'get_line'):
+            SourceFileIndex.__init__(self, self._mapped.string_bytes(self._string_index))
+            return getattr(self, name)
+        raise AttributeError(name)
+
+
+def load_graph(file_path: str) -> CodeStructureGraph:
+    mapped = MappedGraphFile(file_path)
+    meta = mapped.meta
+
+    violation_paths = [{'startpoint': path['startpoint'],
+                        'endpoint': path['endpoint'],
+                        'violation_info': _violation_from_json(path['violation_info'])}
+                       for path in meta['violation_paths']]
+
+    graph = CodeStructureGraph(compact=True)
+    graph._attach_storage(_MappedNodeTable(mapped), _MappedEdgeTable(mapped), mapped.compact_graph(),
+                          set(meta['violation_registers']), violation_paths)
+
+    for path, index in meta['source_files'].items():
+        graph.source_files[path] = _MappedSourceFile(mapped, index)
+
+    for module_name, node_id, ports in meta.get('module_templates', []):
+        graph.add_module_template(ModuleTemplate(module_name, node_id, ports))
+    for node_id, name, module_name, parent_module, named_bindings, ordered_bindings in meta.get('module_instances', []):
+        graph.add_module_instance(ModuleInstance(
+            node_id, name, module_name, parent_module,
+            {port: tuple(parent_ids) for port, parent_ids in named_bindings.items()},
+            tuple(tuple(parent_ids) for parent_ids in ordered_bindings)
+        ))
+
+    return graph
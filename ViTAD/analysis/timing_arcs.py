@@ -0,0 +1,132 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+
+@dataclass(slots=True)
+class TimingArc:
+    source: Hashable
+    target: Hashable
+    logic_depth: int
+    logic_blocks: Tuple[Hashable, ...]
+    path: Tuple[Hashable, ...]
+
+
+class TimingArcGraph:
+
+    def __init__(self, successors: Mapping[Hashable, Iterable[Hashable]], launch_points: Iterable[Hashable],
+                 is_capture: Callable[[Hashable], bool], is_logic: Callable[[Hashable], bool]):
+        self._successors = successors
+        self._is_capture = is_capture
+        self._is_logic = is_logic
+
+        self.arcs: Dict[Tuple[Hashable, Hashable], TimingArc] = {}
+        self.succ: Dict[Hashable, List[Hashable]] = {}
+        self.pred: Dict[Hashable, List[Hashable]] = {}
+
+        for source in dict.fromkeys(launch_points):
+            self._add_endpoint(source)
+            for arc in self._extract_arcs(source):
+                self._add_endpoint(arc.target)
+                self.arcs[(arc.source, arc.target)] = arc
+                self.succ[arc.source].append(arc.target)
+                self.pred[arc.target].append(arc.source)
+
+    def _add_endpoint(self, node: Hashable):
+        if node not in self.succ:
+            self.succ[node] = []
+            self.pred[node] = []
+
+    def _extract_arcs(self, source: Hashable) -> List[TimingArc]:
+        successors = self._successors
+
+        combinational = []
+        members = set()
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for child in successors[node]:
+                if child == source or child in members or self._is_capture(child):
+                    continue
+                members.add(child)
+                combinational.append(child)
+                queue.append(child)
+
+        indegree = dict.fromkeys(combinational, 0)
+        for node in [source] + combinational:
+            for child in successors[node]:
+                if child in members:
+                    indegree[child] += 1
+
+        depth = {source: 1 if self._is_logic(source) else 0}
+        parent: Dict[Hashable, Optional[Hashable]] = {source: None}
+        captured: Dict[Hashable, Tuple[int, Hashable]] = {}
+        processed = set()
+
+        ready = deque([source])
+        pending = iter(combinational)
+        while True:
+            while ready:
+                node = ready.popleft()
+                if node in processed:
+                    continue
+                processed.add(node)
+
+                for child in successors[node]:
+                    if child in members:
+                        if child not in processed:
+                            candidate = depth[node] + (1 if self._is_logic(child) else 0)
+                            if candidate > depth.get(child, -1):
+                                depth[child] = candidate
+                                parent[child] = node
+                        indegree[child] -= 1
+                        if indegree[child] == 0:
+                            ready.append(child)
+                    elif self._is_capture(child):
+                        if child not in captured or depth[node] > captured[child][0]:
+                            captured[child] = (depth[node], node)
+
+            node = next((node for node in pending if node not in processed), None)
+            if node is None:
+                break
+            ready.append(node)
+
+        arcs = []
+        for target, (logic_depth, last) in captured.items():
+            path = [target]
+            while last is not None:
+                path.append(last)
+                last = parent[last]
+            path.reverse()
+
+            logic_blocks = tuple(node for node in path if self._is_logic(node))
+            arcs.append(TimingArc(source=source, target=target, logic_depth=logic_depth,
+                                  logic_blocks=logic_blocks, path=tuple(path)))
+        return arcs
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self.succ
+
+    def __len__(self) -> int:
+        return len(self.succ)
+
+    def number_of_arcs(self) -> int:
+        return len(self.arcs)
+
+    def arc(self, source: Hashable, target: Hashable) -> Optional[TimingArc]:
+        return self.arcs.get((source, target))
+
+    def expand_path(self, endpoint_path: Sequence[Hashable]) -> Optional[List[Hashable]]:
+        if not endpoint_path:
+            return []
+
+        expanded = [endpoint_path[0]]
+        for source, target in zip(endpoint_path, endpoint_path[1:]):
+            expanded.extend(self.arcs[(source, target)].path[1:])
+        if len(set(expanded)) != len(expanded):
+            return None
+        return expanded
+
+    def logic_depth(self, endpoint_path: Sequence[Hashable]) -> int:
+        return sum(self.arcs[(source, target)].logic_depth
+                   for source, target in zip(endpoint_path, endpoint_path[1:]))
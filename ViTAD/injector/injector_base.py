@@ -2,11 +2,15 @@ from pyverilog.vparser.parser import parse
 
 
 class VerilogInjector:
-    def __init__(self, source_code: str):
+    def __init__(self, source_code: str, parse_cache=None):
         self.code = source_code
+        self.parse_cache = parse_cache
         self.ast = self._parse_to_ast()
 
     def _parse_to_ast(self):
+        if self.parse_cache is not None:
+            return self.parse_cache.parse_text(self.code, lambda code: parse([code])[0])
+
         ast, _ = parse([self.code])
         return ast
 